@@ -0,0 +1,218 @@
+"""Benchmark loading, matching, verification and results formatting on synthetic watchlists.
+
+The CSV files are generated up front, then each size runs in its own
+subprocess so peak RSS is measured per size and excludes the generator:
+
+    python benchmarks/bench.py --sizes 1000 10000 100000 1000000 --output bench.json
+
+Results are printed and, with --output, written as JSON for tracking trends
+across releases.
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import pandas as pd  # noqa: E402
+
+from benchmarks.stub_server import StubServer  # noqa: E402
+from comparison import find_candidates, load_files, verify_ids  # noqa: E402
+from parallel_matching import ParallelTitleMatcher  # noqa: E402
+from results_filter import ResultsFilter  # noqa: E402
+from title_index import TitleIndex  # noqa: E402
+from verifier import VerificationEngine  # noqa: E402
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+GENRES = ["Action", "Comedy", "Crime", "Drama", "Horror", "Romance", "Sci-Fi", "Thriller"]
+
+
+def make_vocabulary(rng, size=5000):
+    letters = "abcdefghijklmnopqrstuvwxyz"
+    return ["".join(rng.choice(letters) for _ in range(rng.randint(3, 9))) for _ in range(size)]
+
+
+def generate_csvs(directory, rows, overlap=0.7, seed=0):
+    """Write a synthetic IMDB.csv and Werstreamtes.csv and return their paths.
+
+    About overlap of the IMDB titles also appear in the Werstreamt.es export,
+    some of them with different case and punctuation.
+    """
+    rng = random.Random(seed)
+    vocabulary = make_vocabulary(rng)
+    titles = [" ".join(rng.choices(vocabulary, k=rng.randint(1, 4))).title() for _ in range(rows)]
+    localized = [" ".join(rng.choices(vocabulary, k=rng.randint(1, 4))).title() for _ in range(rows)]
+    years = [rng.randint(1920, 2024) for _ in range(rows)]
+    imdb = pd.DataFrame({
+        "Const": [f"tt{i:07d}" for i in range(1, rows + 1)],
+        "Title": localized,
+        "Original Title": titles,
+        "URL": [f"https://www.imdb.com/title/tt{i:07d}/" for i in range(1, rows + 1)],
+        "Title Type": "movie",
+        "IMDb Rating": [round(rng.uniform(1, 10), 1) for _ in range(rows)],
+        "Year": years,
+        "Genres": [", ".join(rng.sample(GENRES, rng.randint(1, 3))) for _ in range(rows)],
+    })
+
+    listed = [i for i in range(rows) if rng.random() < overlap]
+    werstreamtes_titles = [titles[i].upper() + "!" if i % 5 == 0 else titles[i] for i in listed]
+    werstreamtes = pd.DataFrame({
+        "Title": [localized[i] for i in listed],
+        "OriginalTitle": werstreamtes_titles,
+        "Year": [years[i] for i in listed],
+    })
+
+    imdb_path = os.path.join(directory, "IMDB.csv")
+    werstreamtes_path = os.path.join(directory, "Werstreamtes.csv")
+    imdb.to_csv(imdb_path, index=False)
+    werstreamtes.to_csv(werstreamtes_path, index=False)
+    return imdb_path, werstreamtes_path
+
+
+def peak_rss_mb():
+    """Return the peak resident set size of this process in MiB."""
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS reports bytes
+    return peak / (1024 * 1024) if sys.platform == "darwin" else peak / 1024
+
+
+def run_single(args):
+    """Benchmark one watchlist size on the CSV files in args.data_dir and return the measurements as a dict."""
+    result = {"rows": args.single}
+    imdb_path = os.path.join(args.data_dir, "IMDB.csv")
+    werstreamtes_path = os.path.join(args.data_dir, "Werstreamtes.csv")
+
+    start = time.perf_counter()
+    imdb_data, werstreamtes_data = load_files(imdb_path, werstreamtes_path)
+    result["load_csv_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    load_files(imdb_path, werstreamtes_path)
+    result["load_snapshot_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    title_index = TitleIndex(werstreamtes_data)
+    result["index_s"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    candidates = find_candidates(imdb_data, title_index)
+    result["match_s"] = time.perf_counter() - start
+    result["candidates"] = len(candidates)
+
+    if args.processes > 1:
+        with ParallelTitleMatcher(title_index, workers=args.processes) as matcher:
+            start = time.perf_counter()
+            find_candidates(imdb_data, matcher)
+            result["match_parallel_s"] = time.perf_counter() - start
+
+    try:
+        from results_view import DISPLAY_COLUMNS, format_rows
+        start = time.perf_counter()
+        format_rows(candidates, [col for col in DISPLAY_COLUMNS if col in candidates.columns])
+        result["format_rows_s"] = time.perf_counter() - start
+    except ImportError:
+        result["format_rows_s"] = None  # tkinter isn't available
+
+    start = time.perf_counter()
+    results_filter = ResultsFilter(candidates)
+    result["filter_index_s"] = time.perf_counter() - start
+    start = time.perf_counter()
+    results_filter.apply("the", year=(1990, 2010), sort_column="IMDb Rating", descending=True)
+    result["filter_query_s"] = time.perf_counter() - start
+
+    imdb_ids = candidates["IMDB ID"][candidates["IMDB ID"] != ""].head(args.verify_limit)
+    with StubServer(latency=args.latency, error_rate=args.error_rate, seed=args.seed) as stub:
+        engine = VerificationEngine(max_workers=args.workers, requests_per_second=args.rate,
+                                    search_url=stub.search_url)
+        start = time.perf_counter()
+        verdicts = verify_ids(imdb_ids, engine)
+        elapsed = time.perf_counter() - start
+        result["verify_ids"] = len(verdicts)
+        result["verify_s"] = elapsed
+        result["verify_per_s"] = len(verdicts) / elapsed if elapsed else None
+        result["stub_requests"] = stub.requests
+        result["stub_connections"] = stub.connections
+
+    result["peak_rss_mb"] = peak_rss_mb()
+    return result
+
+
+def git_revision():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              cwd=os.path.dirname(os.path.abspath(__file__)), check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark the comparison pipeline on synthetic watchlists.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=DEFAULT_SIZES,
+                        help="IMDB watchlist sizes to benchmark (default: 1k 10k 100k 1M)")
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    parser.add_argument("--latency", type=float, default=0.05, help="stub response latency in seconds")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of stub requests failing with 503")
+    parser.add_argument("--verify-limit", type=int, default=500,
+                        help="maximum number of candidates verified against the stub per size")
+    parser.add_argument("--workers", type=int, default=8, help="concurrent lookups")
+    parser.add_argument("--rate", type=float, default=1000.0, help="lookups started per second")
+    parser.add_argument("--processes", type=int, default=0,
+                        help="also time matching on this many worker processes (default: off)")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--single", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--data-dir", help=argparse.SUPPRESS)
+    return parser.parse_args(argv)
+
+
+def main(argv=None):
+    args = parse_args(argv)
+    if args.single is not None:
+        print(json.dumps(run_single(args)))
+        return 0
+
+    results = []
+    passthrough = ["--latency", str(args.latency), "--error-rate", str(args.error_rate),
+                   "--verify-limit", str(args.verify_limit), "--workers", str(args.workers),
+                   "--rate", str(args.rate), "--processes", str(args.processes), "--seed", str(args.seed)]
+    for rows in args.sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            generate_csvs(directory, rows, seed=args.seed)
+            generate_s = time.perf_counter() - start
+            completed = subprocess.run([sys.executable, os.path.abspath(__file__), "--single", str(rows),
+                                        "--data-dir", directory] + passthrough,
+                                       capture_output=True, text=True, check=True)
+        result = json.loads(completed.stdout.strip().splitlines()[-1])
+        result["generate_s"] = generate_s
+        results.append(result)
+        print(f"{rows:>9} rows: load {result['load_csv_s']:.2f}s (snapshot {result['load_snapshot_s']:.2f}s), "
+              f"match {result['index_s'] + result['match_s']:.2f}s, "
+              f"verify {result['verify_per_s'] or 0:.0f}/s, peak RSS {result['peak_rss_mb']:.0f} MiB",
+              file=sys.stderr)
+
+    report = {
+        "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S%z"),
+        "revision": git_revision(),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "platform": platform.platform(),
+        "settings": {key: value for key, value in vars(args).items() if key not in ("output", "single", "data_dir")},
+        "results": results,
+    }
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+    else:
+        print(json.dumps(report, indent=2))
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,104 @@
+"""Local stand-in for the werstreamt.es search page, with configurable latency and error rate."""
+import http.server
+import random
+import threading
+import time
+import zlib
+from urllib.parse import parse_qs, urlsplit
+
+NO_RESULTS_TEXT = "Deine Suche lieferte leider keine Ergebnisse"
+
+# Markup around the results, roughly the size of a real search page
+PAGE_HEADER = "<html><head><title>Suche</title></head><body>" + "<div class='nav'></div>" * 400
+PAGE_FOOTER = "<div class='footer'></div>" * 2000 + "</body></html>"
+
+
+class _QuietServer(http.server.ThreadingHTTPServer):
+    daemon_threads = True
+
+    def handle_error(self, request, client_address):
+        pass  # Clients close connections early on purpose
+
+
+def is_listed(imdb_id, missing_ratio):
+    """Decide deterministically whether the stub lists an IMDB ID."""
+    return (zlib.crc32(imdb_id.encode("ascii")) % 1000) / 1000 >= missing_ratio
+
+
+def search_page(imdb_id, missing_ratio):
+    """Render the search results page for one IMDB ID."""
+    if is_listed(imdb_id, missing_ratio):
+        results = (f'<ul class="results"><li><a href="/film/details/{imdb_id[2:]}/stub-{imdb_id}/">'
+                   f"<strong>Stub film {imdb_id}</strong></a></li></ul>")
+    else:
+        results = f"<p>{NO_RESULTS_TEXT}</p>"
+    search_form = f'<form><input name="q" value="{imdb_id}"></form>'
+    return (PAGE_HEADER + search_form + results + PAGE_FOOTER).encode("utf-8")
+
+
+class StubServer:
+    """Serve /filme-serien/?q=<imdb_id> on localhost in a background thread.
+
+    Every request sleeps for latency seconds, and error_rate of them fail
+    with a 503 so the retry and unknown-verdict paths get exercised too.
+    """
+
+    def __init__(self, latency=0.05, error_rate=0.0, missing_ratio=0.3, seed=0):
+        self.latency = latency
+        self.error_rate = error_rate
+        self.missing_ratio = missing_ratio
+        self.requests = 0
+        self.connections = 0
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._server = _QuietServer(("127.0.0.1", 0), self._handler_class())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def search_url(self):
+        return f"http://127.0.0.1:{self._server.server_port}/filme-serien/?q={{imdb_id}}"
+
+    def _handler_class(self):
+        stub = self
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def setup(self):
+                super().setup()
+                with stub._lock:
+                    stub.connections += 1
+
+            def do_GET(self):
+                with stub._lock:
+                    stub.requests += 1
+                    failed = stub._random.random() < stub.error_rate
+                time.sleep(stub.latency)
+                if failed:
+                    self.send_response(503)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                imdb_id = parse_qs(urlsplit(self.path).query).get("q", [""])[0]
+                body = search_page(imdb_id, stub.missing_ratio)
+                self.send_response(200)
+                self.send_header("Content-Type", "text/html; charset=utf-8")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                try:
+                    self.wfile.write(body)
+                except (BrokenPipeError, ConnectionResetError):
+                    pass  # The client stopped reading once it knew the verdict
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._server.shutdown()
+        self._server.server_close()
@@ -0,0 +1,134 @@
+"""Local mirror of the Werstreamt.es catalog, so known entries are verified without a web request."""
+import json
+import os
+import sqlite3
+import threading
+import time
+
+import pandas as pd
+
+from comparison import extract_imdb_ids, format_imdb_ids
+from snapshot import file_fingerprint
+from verifier import FOUND, VerificationResult
+
+MIRROR_FILENAME = "werstreamtes_mirror.sqlite"
+
+# Rows read at a time when harvesting IMDB IDs from a Werstreamt.es export
+_HARVEST_CHUNKSIZE = 50000
+
+
+def mirror_path_for(imdb_path):
+    """Return the catalog mirror path that lives next to the IMDB CSV."""
+    return os.path.join(os.path.dirname(os.path.abspath(imdb_path)), MIRROR_FILENAME)
+
+
+def imdb_id_columns(columns):
+    """Return the columns of a Werstreamt.es export that may hold IMDB IDs or IMDb links."""
+    return [col for col in columns if 'imdb' in col.lower()]
+
+
+class CatalogMirror:
+    """IMDB IDs known to be listed on Werstreamt.es, with the title and URL they are listed under.
+
+    The mirror is filled from found search results and from Werstreamt.es
+    exports that carry an IMDb column, and it only ever says "found": an ID
+    it has never seen still needs a web lookup. Entries don't expire, since
+    titles are hardly ever removed from the Werstreamt.es catalog.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS entries ("
+            "imdb_id TEXT PRIMARY KEY, title TEXT, url TEXT, source TEXT NOT NULL, added_at REAL NOT NULL)"
+        )
+        # Fingerprints of the exports already harvested, so unchanged files are skipped
+        self._conn.execute("CREATE TABLE IF NOT EXISTS harvested (path TEXT PRIMARY KEY, fingerprint TEXT)")
+        self._conn.execute("CREATE TEMP TABLE lookup (imdb_id TEXT PRIMARY KEY)")
+        self._conn.commit()
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM entries").fetchone()[0]
+
+    def add_many(self, entries, source):
+        """Add (imdb_id, title, url) tuples, keeping the title and URL of entries already known."""
+        now = time.time()
+        with self._lock:
+            self._conn.executemany(
+                "INSERT INTO entries (imdb_id, title, url, source, added_at) VALUES (?, ?, ?, ?, ?) "
+                "ON CONFLICT (imdb_id) DO UPDATE SET "
+                "title = coalesce(entries.title, excluded.title), url = coalesce(entries.url, excluded.url)",
+                ((imdb_id, title, url, source, now) for imdb_id, title, url in entries),
+            )
+
+    def add(self, imdb_id, result):
+        """Record a FOUND result of a web lookup. Call commit() to persist it."""
+        if result.verdict == FOUND:
+            self.add_many([(imdb_id, result.title, result.url)], 'search')
+
+    def lookup(self, imdb_ids):
+        """Return a dict mapping each ID in the mirror to a FOUND VerificationResult.
+
+        All IDs are resolved with a single indexed join against a temporary table.
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM lookup")
+            self._conn.executemany("INSERT OR IGNORE INTO lookup (imdb_id) VALUES (?)",
+                                   ((imdb_id,) for imdb_id in imdb_ids))
+            rows = self._conn.execute(
+                "SELECT entries.imdb_id, entries.title, entries.url FROM lookup "
+                "JOIN entries ON entries.imdb_id = lookup.imdb_id"
+            ).fetchall()
+        return {imdb_id: VerificationResult(FOUND, title, url) for imdb_id, title, url in rows}
+
+    def harvest_cache(self, cache):
+        """Add every entry the verification cache has ever found, however old."""
+        self.add_many(cache.found_entries(), 'cache')
+
+    def harvest_export(self, werstreamtes_path):
+        """Add the IMDB IDs listed in a Werstreamt.es export, if it has an IMDb column.
+
+        The export is read in chunks, and skipped if it hasn't changed since
+        it was last harvested. Returns the number of IDs read.
+        """
+        path = os.path.abspath(werstreamtes_path)
+        fingerprint = json.dumps(file_fingerprint(path))
+        with self._lock:
+            row = self._conn.execute("SELECT fingerprint FROM harvested WHERE path = ?", (path,)).fetchone()
+        if row is not None and row[0] == fingerprint:
+            return 0
+
+        columns = imdb_id_columns(pd.read_csv(path, nrows=0).columns)
+        harvested = 0
+        if columns:
+            usecols = set(columns) | {'Title'}
+            for chunk in pd.read_csv(path, usecols=lambda col: col in usecols, dtype='string',
+                                     chunksize=_HARVEST_CHUNKSIZE):
+                # Take the ID from the first IMDb column that has one
+                imdb_ids = extract_imdb_ids(chunk[columns[0]])
+                for col in columns[1:]:
+                    imdb_ids = imdb_ids.fillna(extract_imdb_ids(chunk[col]))
+                listed = imdb_ids.notna()
+                titles = chunk['Title'] if 'Title' in chunk.columns else pd.Series(pd.NA, index=chunk.index)
+                titles = titles[listed].astype(object)
+                self.add_many(zip(format_imdb_ids(imdb_ids[listed]), titles.where(titles.notna(), None),
+                                  [None] * len(titles)), 'export')
+                harvested += len(titles)
+
+        with self._lock:
+            self._conn.execute("INSERT OR REPLACE INTO harvested (path, fingerprint) VALUES (?, ?)",
+                               (path, fingerprint))
+            self._conn.commit()
+        return harvested
+
+    def commit(self):
+        with self._lock:
+            self._conn.commit()
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,150 @@
+"""Comparison of an IMDB export against a Werstreamt.es export, independent of any GUI."""
+import os
+
+from snapshot import load_csv
+from verification_cache import CACHE_FILENAME
+from verifier import FOUND, UNKNOWN
+
+
+# Columns read from the Werstreamt.es export; Year is only read when matching release years
+WERSTREAMTES_COLUMNS = ['Title', 'OriginalTitle']
+# Dtypes of the columns the comparison uses; numeric values that don't parse are read as NA
+COLUMN_DTYPES = {
+    'Year': 'Int16',
+    'IMDb Rating': 'float32',
+    'Genres': 'category',
+}
+
+
+class ComparisonCancelled(Exception):
+    """Raised when a comparison is cancelled before it has finished."""
+
+
+def werstreamtes_columns(use_year=False):
+    """Return the columns read from the Werstreamt.es export."""
+    return WERSTREAMTES_COLUMNS + ['Year'] if use_year else WERSTREAMTES_COLUMNS
+
+
+def load_files(imdb_path, werstreamtes_path, use_year=False):
+    """Load both CSV files. Raises ValueError if a required column is missing.
+
+    The IMDB export is loaded with all its columns, so they all end up in
+    the results. Of the Werstreamt.es export only the titles are loaded,
+    and the year with use_year.
+    """
+    imdb_data = load_csv(imdb_path, None, COLUMN_DTYPES)
+    werstreamtes_data = load_csv(werstreamtes_path, werstreamtes_columns(use_year), COLUMN_DTYPES)
+    check_columns(imdb_data.columns, werstreamtes_data.columns)
+    return imdb_data, werstreamtes_data
+
+
+def check_columns(imdb_columns, werstreamtes_columns):
+    """Raise ValueError if either export lacks one of its title columns."""
+    if 'Original Title' not in imdb_columns or 'Title' not in imdb_columns:
+        raise ValueError("IMDB.csv must have 'Original Title' and 'Title' columns.")
+
+    if 'OriginalTitle' not in werstreamtes_columns or 'Title' not in werstreamtes_columns:
+        raise ValueError("Werstreamtes.csv must have 'OriginalTitle' and 'Title' columns.")
+
+
+def cache_path_for(imdb_path):
+    """Return the verification cache path that lives next to the IMDB CSV."""
+    return os.path.join(os.path.dirname(os.path.abspath(imdb_path)), CACHE_FILENAME)
+
+
+def extract_imdb_ids(urls):
+    """Extract the numeric part of the IMDB IDs (tt followed by digits) from a Series of URLs.
+
+    Returns a nullable UInt32 Series, with NA where a URL has no IMDB ID.
+    """
+    return urls.astype('string').str.extract(r'tt(\d+)', expand=False).astype('UInt32')
+
+
+def format_imdb_ids(imdb_numbers):
+    """Format numeric IMDB IDs as tt strings with at least 7 digits, and NA as ""."""
+    return ('tt' + imdb_numbers.astype('string').str.zfill(7)).fillna("").astype(object)
+
+
+def find_candidates(imdb_data, title_index, fuzzy_matcher=None):
+    """Return the IMDB rows whose titles aren't in the Werstreamt.es title index.
+
+    With a fuzzy_matcher, rows without an exact match are dropped as well if
+    one of their titles is similar enough to a Werstreamt.es title. If the
+    IMDB data has a URL column, the result gets an 'IMDB ID' column.
+    """
+    missing_mask = ~title_index.match(imdb_data)
+    if fuzzy_matcher is not None and missing_mask.any():
+        missing_mask[missing_mask] = ~fuzzy_matcher.match(imdb_data[missing_mask])
+
+    candidates = imdb_data[missing_mask].copy()
+    if 'URL' in candidates.columns:
+        candidates['IMDB ID'] = format_imdb_ids(extract_imdb_ids(candidates['URL']))
+    return candidates
+
+
+def entries_to_verify(candidates):
+    """Return the candidates that have an IMDB ID and can be verified on the web."""
+    if len(candidates) == 0 or 'IMDB ID' not in candidates.columns:
+        return candidates.iloc[0:0]
+    return candidates[candidates['IMDB ID'].str.len() > 0]
+
+
+def verify_ids(imdb_ids, engine, progress=None, cancel_event=None):
+    """Verify the given IMDB IDs and return a dict mapping each one to its verdict.
+
+    Duplicate IDs are only looked up once. progress, if given, is called as
+    progress(done, total) after each lookup. If cancel_event is set while
+    lookups are running, ComparisonCancelled is raised.
+    """
+    imdb_ids = list(dict.fromkeys(imdb_ids))
+    verdicts = {}
+    results = engine.verify_all(imdb_ids)
+    try:
+        for done, (imdb_id, result) in enumerate(results, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ComparisonCancelled()
+            verdicts[imdb_id] = result.verdict
+            if progress is not None:
+                progress(done, len(imdb_ids))
+    finally:
+        # Stops the engine from starting any further lookups
+        results.close()
+    return verdicts
+
+
+def verify_candidates(candidates, engine, progress=None, cancel_event=None):
+    """Return the candidates that Werstreamt.es doesn't confirm as available.
+
+    The result gets a 'Verification' column holding each row's verdict:
+    MISSING, or UNKNOWN if the lookup failed and should be retried. progress
+    and cancel_event work as in verify_ids. Candidates are returned unchanged
+    if none of them can be verified.
+    """
+    to_verify = entries_to_verify(candidates)
+    if len(to_verify) == 0:
+        return candidates
+
+    verdicts = verify_ids(to_verify['IMDB ID'], engine, progress, cancel_event)
+
+    # Drop entries that were found on Werstreamt.es, keeping failed lookups marked as unknown
+    verification = to_verify['IMDB ID'].map(verdicts)
+    verification = verification[verification != FOUND]
+    missing_entries = candidates.loc[verification.index].copy()
+    missing_entries['Verification'] = verification
+    return missing_entries
+
+
+def describe_results(missing_entries):
+    """Return a one-line summary of the verified results for status messages."""
+    unknown_count = 0
+    if 'Verification' in missing_entries.columns:
+        unknown_count = int((missing_entries['Verification'] == UNKNOWN).sum())
+    return describe_counts(len(missing_entries), unknown_count)
+
+
+def describe_counts(missing_count, unknown_count):
+    """Return the summary of describe_results from the number of missing and unverified rows."""
+    message = f"Found {missing_count - unknown_count} confirmed missing entries in IMDB.csv"
+    if unknown_count:
+        message += f" ({unknown_count} could not be verified and will be retried on the next run)"
+    return message
@@ -0,0 +1,225 @@
+"""Streaming result export to CSV, JSON Lines or Parquet that resumes from its last checkpoint."""
+import json
+import os
+import time
+
+import pandas as pd
+
+from comparison import ComparisonCancelled, entries_to_verify
+from snapshot import HAVE_PYARROW
+from verifier import FOUND, UNKNOWN
+
+EXPORT_FORMATS = {'.csv': 'csv', '.jsonl': 'jsonl', '.parquet': 'parquet'}
+CHECKPOINT_SUFFIX = '.checkpoint'
+SPOOL_SUFFIX = '.spool.jsonl'
+CHECKPOINT_VERSION = 1
+
+
+def export_format(path):
+    """Return the output format for a path by its extension, defaulting to CSV."""
+    return EXPORT_FORMATS.get(os.path.splitext(path)[1].lower(), 'csv')
+
+
+def fsync(f):
+    f.flush()
+    os.fsync(f.fileno())
+
+
+class ResultExporter:
+    """Append result rows to an output file, with fsync'd checkpoints to resume from.
+
+    Rows are added per key (an IMDB ID, or any other unit of work) and
+    buffered until the next checkpoint, which happens every checkpoint_every
+    keys or checkpoint_seconds. A checkpoint writes the buffered rows, fsyncs
+    the output, and then appends the keys and the output's length to a
+    journal next to it.
+
+    If the journal of an interrupted export with the same format, columns and
+    source exists, the output is truncated to its last checkpoint and the
+    keys recorded in it are available in .done so they can be skipped.
+    Parquet files can't be appended to, so Parquet rows go to a JSON Lines
+    spool that is converted by finish(), which needs pyarrow.
+    """
+
+    def __init__(self, path, columns, dtypes=None, source=None, checkpoint_every=100, checkpoint_seconds=5.0):
+        self.path = path
+        self.format = export_format(path)
+        if self.format == 'parquet' and not HAVE_PYARROW:
+            raise ValueError("Parquet output needs pyarrow to be installed.")
+        self.columns = list(columns)
+        self.checkpoint_every = checkpoint_every
+        self.checkpoint_seconds = checkpoint_seconds
+        self.data_path = path + SPOOL_SUFFIX if self.format == 'parquet' else path
+        self.journal_path = path + CHECKPOINT_SUFFIX
+        self.header = {
+            'version': CHECKPOINT_VERSION,
+            'format': self.format,
+            'columns': self.columns,
+            'dtypes': {col: str(dtype) for col, dtype in (dtypes or {}).items() if col in self.columns},
+            'source': source,
+        }
+
+        self.done = set()
+        self.rows = 0
+        self.unknown = 0
+        self._pending_keys = []
+        self._pending_rows = []
+        self._last_checkpoint = time.monotonic()
+
+        offset = self._read_journal()
+        if offset is None:
+            self._data = open(self.data_path, 'wb')
+            if self.format == 'csv':
+                self._data.write(pd.DataFrame(columns=self.columns).to_csv(index=False).encode('utf-8'))
+            offset = self._data.tell()
+        else:
+            self._data = open(self.data_path, 'r+b')
+            self._data.truncate(offset)
+            self._data.seek(offset)
+        fsync(self._data)
+
+        # Rewrite the journal as a single checkpoint, dropping any torn last line
+        with open(self.journal_path + '.tmp', 'w', encoding='utf-8') as journal:
+            journal.write(json.dumps(self.header) + '\n')
+            journal.write(json.dumps({'offset': offset, 'keys': sorted(self.done), 'rows': self.rows,
+                                      'unknown': self.unknown}) + '\n')
+            fsync(journal)
+        os.replace(self.journal_path + '.tmp', self.journal_path)
+        self._journal = open(self.journal_path, 'a', encoding='utf-8')
+
+    @property
+    def resumed(self):
+        """Whether this export continues an interrupted one."""
+        return bool(self.done)
+
+    def _read_journal(self):
+        """Load the checkpoints of an interrupted export and return its output length, or None."""
+        try:
+            with open(self.journal_path, encoding='utf-8') as journal:
+                lines = iter(journal)
+                if json.loads(next(lines)) != self.header:
+                    return None
+                offset = None
+                for line in lines:
+                    try:
+                        checkpoint = json.loads(line)
+                    except ValueError:
+                        break  # Torn write while the previous run died
+                    offset = checkpoint['offset']
+                    self.done.update(checkpoint['keys'])
+                    self.rows += checkpoint['rows']
+                    self.unknown += checkpoint['unknown']
+        except (OSError, ValueError, StopIteration):
+            self.done.clear()
+            self.rows = self.unknown = 0
+            return None
+        if offset is None or not os.path.exists(self.data_path) or os.path.getsize(self.data_path) < offset:
+            self.done.clear()
+            self.rows = self.unknown = 0
+            return None
+        return offset
+
+    def add(self, key, rows=None):
+        """Record key as processed, with the result rows it produced, if any."""
+        self._pending_keys.append(key)
+        if rows is not None and len(rows) > 0:
+            self._pending_rows.append(rows)
+        if (len(self._pending_keys) >= self.checkpoint_every
+                or time.monotonic() - self._last_checkpoint >= self.checkpoint_seconds):
+            self.checkpoint()
+
+    def checkpoint(self):
+        """Write the buffered rows and durably record the keys added since the last checkpoint."""
+        self._last_checkpoint = time.monotonic()
+        if not self._pending_keys:
+            return
+        rows = unknown = 0
+        if self._pending_rows:
+            data = pd.concat(self._pending_rows).reindex(columns=self.columns)
+            rows = len(data)
+            if 'Verification' in data.columns:
+                unknown = int((data['Verification'] == UNKNOWN).sum())
+            if self.format == 'csv':
+                text = data.to_csv(header=False, index=False)
+            else:
+                # Widen float32 through its shortest repr so 7.2 isn't written as 7.1999998093
+                for col in data.columns[data.dtypes == 'float32']:
+                    data[col] = pd.to_numeric(data[col].astype(str), errors='coerce')
+                text = data.to_json(orient='records', lines=True, force_ascii=False, date_format='iso')
+                if not text.endswith('\n'):
+                    text += '\n'
+            self._data.write(text.encode('utf-8'))
+        fsync(self._data)
+
+        checkpoint = {'offset': self._data.tell(), 'keys': self._pending_keys, 'rows': rows, 'unknown': unknown}
+        self._journal.write(json.dumps(checkpoint) + '\n')
+        fsync(self._journal)
+
+        self.done.update(self._pending_keys)
+        self.rows += rows
+        self.unknown += unknown
+        self._pending_keys = []
+        self._pending_rows = []
+
+    def close(self):
+        """Checkpoint and close the files, leaving the journal so the export can be resumed."""
+        if self._data.closed:
+            return
+        self.checkpoint()
+        self._data.close()
+        self._journal.close()
+
+    def finish(self):
+        """Complete the export: convert the Parquet spool and remove the journal."""
+        self.close()
+        if self.format == 'parquet':
+            if os.path.getsize(self.data_path) > 0:
+                # Keep the spooled values as written; the header dtypes restore the column types
+                data = pd.read_json(self.data_path, lines=True, dtype=False, convert_dates=False)
+                data = data.reindex(columns=self.columns)
+            else:
+                data = pd.DataFrame(columns=self.columns)
+            dtypes = {col: dtype for col, dtype in self.header['dtypes'].items() if dtype != 'object'}
+            data.astype(dtypes).to_parquet(self.path, index=False)
+            os.remove(self.data_path)
+        os.remove(self.journal_path)
+
+
+def write_results(data, path):
+    """Write a finished result table to path, in the format given by its extension."""
+    exporter = ResultExporter(path, data.columns, data.dtypes.to_dict())
+    exporter.add('', data)
+    exporter.finish()
+
+
+def export_verified(candidates, engine, exporter, progress=None, cancel_event=None):
+    """Verify the candidates and stream those not found on Werstreamt.es to exporter.
+
+    Rows are written as their verdicts come in, with the same 'Verification'
+    column and the same rows as verify_candidates, but in the order the
+    lookups finish. IMDB IDs that exporter already has from an interrupted
+    run are skipped. progress and cancel_event work as in verify_ids.
+    """
+    to_verify = entries_to_verify(candidates)
+    if len(to_verify) == 0:
+        # Nothing can be verified, so every candidate is kept as is
+        if '' not in exporter.done:
+            exporter.add('', candidates)
+        return
+
+    positions = to_verify.groupby('IMDB ID', sort=False).indices
+    imdb_ids = [imdb_id for imdb_id in positions if imdb_id not in exporter.done]
+    results = engine.verify_all(imdb_ids)
+    try:
+        for done, (imdb_id, result) in enumerate(results, start=1):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ComparisonCancelled()
+            rows = None
+            if result.verdict != FOUND:
+                rows = to_verify.iloc[positions[imdb_id]].assign(Verification=result.verdict)
+            exporter.add(imdb_id, rows)
+            if progress is not None:
+                progress(done, len(imdb_ids))
+    finally:
+        # Stops the engine from starting any further lookups
+        results.close()
@@ -0,0 +1,140 @@
+"""Fuzzy title matching with trigram blocking, for titles the exact index misses."""
+import re
+from collections import Counter
+
+import numpy as np
+import pandas as pd
+
+from title_index import normalize_titles
+
+DEFAULT_THRESHOLD = 0.85
+
+# Roman numerals up to 39, as used for sequels and episodes ("rocky iii", "episode iv")
+ROMAN_NUMERAL_RE = re.compile(r'x{0,3}(?:ix|iv|v?i{0,3})')
+ROMAN_VALUES = {'i': 1, 'v': 5, 'x': 10}
+
+
+def roman_to_int(numeral):
+    """Return the value of a lowercase Roman numeral made of i, v and x."""
+    values = [ROMAN_VALUES[letter] for letter in numeral]
+    return sum(-value if value < following else value
+               for value, following in zip(values, values[1:] + [0]))
+
+
+def title_numbers(title):
+    """Return the numbers in a normalized title, in order, with Roman numerals converted.
+
+    "rocky iii" and "rocky 3" both give (3,), so sequels can be told apart
+    even where their titles only differ in a character or two.
+    """
+    numbers = []
+    for token in title.split():
+        if token.isdigit():
+            numbers.append(int(token))
+        elif ROMAN_NUMERAL_RE.fullmatch(token):
+            numbers.append(roman_to_int(token))
+    return tuple(numbers)
+
+
+def trigrams(title):
+    """Return the set of character trigrams of a normalized title, padded at both ends."""
+    padded = f"  {title} "
+    return {padded[i:i + 3] for i in range(len(padded) - 2)}
+
+
+def dice_similarity(grams_a, grams_b):
+    """Return the Dice coefficient of two trigram sets, between 0 and 1."""
+    if not grams_a or not grams_b:
+        return 0.0
+    return 2 * len(grams_a & grams_b) / (len(grams_a) + len(grams_b))
+
+
+class FuzzyTitleMatcher:
+    """Find Werstreamt.es titles that are similar to, but not exactly, an IMDB title.
+
+    An inverted index from trigram to title blocks the search: each query is
+    only scored against the max_candidates titles sharing the most trigrams
+    with it. Trigrams that occur in more than max_gram_frequency titles carry
+    little information and are skipped, which keeps every lookup bounded no
+    matter how large the Werstreamt.es export is.
+
+    Titles only match if they contain the same numbers, so "Rocky III"
+    never matches "Rocky II" however similar the rest of the title is. With
+    use_year, like TitleIndex, they also only match if the release years
+    agree or one of them is unknown, so a remake doesn't match the original.
+    """
+
+    def __init__(self, werstreamtes_data, threshold=DEFAULT_THRESHOLD, max_candidates=20,
+                 max_gram_frequency=2000, use_year=False):
+        self.threshold = threshold
+        self.max_candidates = max_candidates
+        self.max_gram_frequency = max_gram_frequency
+        self.use_year = use_year and 'Year' in werstreamtes_data.columns
+
+        titles = pd.concat([normalize_titles(werstreamtes_data['OriginalTitle']),
+                            normalize_titles(werstreamtes_data['Title'])], ignore_index=True)
+        self._titles = titles.dropna().unique().tolist()
+        self._grams = [trigrams(title) for title in self._titles]
+        self._numbers = [title_numbers(title) for title in self._titles]
+        self._years = None
+        if self.use_year:
+            # The years each title is listed with; None stands for an entry without a year
+            years = pd.to_numeric(werstreamtes_data['Year'], errors='coerce')
+            listed = pd.DataFrame({'title': titles, 'year': pd.concat([years, years], ignore_index=True)})
+            year_sets = listed.dropna(subset=['title']).groupby('title', sort=False)['year'].agg(
+                lambda values: frozenset(None if pd.isna(value) else int(value) for value in values))
+            self._years = year_sets.reindex(self._titles).tolist()
+
+        postings = {}
+        for title_id, grams in enumerate(self._grams):
+            for gram in grams:
+                postings.setdefault(gram, []).append(title_id)
+        self._postings = {gram: ids for gram, ids in postings.items() if len(ids) <= max_gram_frequency}
+
+    def _year_agrees(self, title_id, year):
+        if self._years is None or year is None:
+            return True
+        years = self._years[title_id]
+        return year in years or None in years
+
+    def best_match(self, title, year=None):
+        """Return (score, werstreamtes_title) of the most similar title with the same numbers, or (0.0, None).
+
+        With use_year and a year, only titles listed with that year or without one are considered.
+        """
+        grams = trigrams(title)
+        numbers = title_numbers(title)
+        shared = Counter()
+        for gram in grams:
+            shared.update(self._postings.get(gram, ()))
+
+        best_score, best_title = 0.0, None
+        for title_id, _ in shared.most_common(self.max_candidates):
+            if self._numbers[title_id] != numbers or not self._year_agrees(title_id, year):
+                continue
+            score = dice_similarity(grams, self._grams[title_id])
+            if score > best_score:
+                best_score, best_title = score, self._titles[title_id]
+        return best_score, best_title
+
+    def match(self, imdb_data):
+        """Return a boolean array marking IMDB rows with a title above the threshold."""
+        scores = {}
+
+        def is_similar(title, year):
+            if pd.isna(title):
+                return False
+            if (title, year) not in scores:
+                scores[title, year] = self.best_match(title, year)[0]
+            return scores[title, year] >= self.threshold
+
+        years = [None] * len(imdb_data)
+        if self.use_year and 'Year' in imdb_data.columns:
+            years = [None if pd.isna(year) else int(year)
+                     for year in pd.to_numeric(imdb_data['Year'], errors='coerce')]
+        found = np.zeros(len(imdb_data), dtype=bool)
+        for column in ('Original Title', 'Title'):
+            titles = normalize_titles(imdb_data[column])
+            found |= np.fromiter((is_similar(title, year) for title, year in zip(titles, years)), dtype=bool,
+                                 count=len(titles))
+        return found
@@ -0,0 +1,673 @@
+import tkinter as tk
+from tkinter import filedialog, ttk, messagebox
+import csv
+import os
+import queue
+import threading
+from pathlib import Path
+from PIL import Image, ImageTk  # Add PIL import for image handling
+from catalog_mirror import CatalogMirror, mirror_path_for
+from comparison import (ComparisonCancelled, cache_path_for, describe_results, entries_to_verify, find_candidates,
+                        load_files, verify_candidates)
+from export import write_results
+from fuzzy_matching import FuzzyTitleMatcher
+from incremental import compare_incremental
+from metrics import Metrics
+from results_filter import ResultsFilter
+from results_view import DISPLAY_COLUMNS, VirtualTreeview, format_rows
+from title_index import TitleIndex
+from verification_cache import VerificationCache
+from verifier import VerificationEngine
+
+# Genre filter entry that doesn't filter
+ALL_GENRES = "All genres"
+
+
+def parse_bound(text):
+    """Return a range filter bound typed by the user as a number, or None if it is empty or invalid."""
+    try:
+        return float(text.replace(',', '.'))
+    except ValueError:
+        return None
+
+
+class CSVComparatorApp:
+    # How often the GUI checks the worker queue for progress, in milliseconds
+    POLL_INTERVAL_MS = 100
+    
+    def __init__(self, root):
+        self.root = root
+        self.root.title("IMDB Werstreamt.es comparison tool")
+        self.root.geometry("1200x700")
+        
+        # Set application icon
+        icon_path = os.path.join(os.path.dirname(__file__), "tarpan.ico")
+        if os.path.exists(icon_path):
+            try:
+                # Try to load icon using PIL
+                icon = Image.open(icon_path)
+                # Convert to PhotoImage
+                photo = ImageTk.PhotoImage(icon)
+                self.root.wm_iconphoto(True, photo)
+            except Exception as e:
+                print(f"Warning: Could not load icon: {e}")
+        
+        # Set theme - use the most modern looking theme available
+        style = ttk.Style()
+        available_themes = style.theme_names()
+        if 'clam' in available_themes:
+            style.theme_use('clam')
+        
+        # Configure styles
+        style.configure('TButton', font=('Helvetica', 10), padding=6)
+        style.configure('TLabel', font=('Helvetica', 10))
+        style.configure('TLabelframe', font=('Helvetica', 10, 'bold'))
+        style.configure('TLabelframe.Label', font=('Helvetica', 10, 'bold'))
+        style.configure('Header.TLabel', font=('Helvetica', 12, 'bold'))
+        style.configure('Action.TButton', font=('Helvetica', 10, 'bold'))
+        
+        # Custom treeview styling
+        style.configure("Treeview", 
+                        background="#f8f8f8",
+                        foreground="black",
+                        rowheight=25,
+                        fieldbackground="#f8f8f8",
+                        font=('Helvetica', 9))
+        style.configure("Treeview.Heading", 
+                        font=('Helvetica', 10, 'bold'),
+                        background="#e0e0e0")
+        style.map('Treeview', background=[('selected', '#3c7fb1')])
+        
+        self.file1_path = tk.StringVar()
+        self.file2_path = tk.StringVar()
+        self.comparison_column = tk.StringVar()
+        self.file1_data = None
+        self.file2_data = None
+        self.common_columns = []
+        self.missing_entries = None
+        self.fuzzy_matching = tk.BooleanVar(value=False)
+        self.incremental = tk.BooleanVar(value=False)
+        self.use_mirror = tk.BooleanVar(value=False)
+        self.metrics = None
+        
+        # Filter and sort state of the results table
+        self.results_filter = None
+        self.sort_column = None
+        self.sort_descending = False
+        self.search_var = tk.StringVar()
+        self.year_from = tk.StringVar()
+        self.year_to = tk.StringVar()
+        self.rating_from = tk.StringVar()
+        self.rating_to = tk.StringVar()
+        self.genre_var = tk.StringVar(value=ALL_GENRES)
+        self.filter_count_var = tk.StringVar()
+        
+        # Background comparison worker and the queue it reports through
+        self.worker = None
+        self.worker_queue = None
+        self.cancel_event = None
+        
+        # Set default file paths for the example files
+        imdb_csv = os.path.join(os.getcwd(), "IMDB.csv")
+        werstreamtes_csv = os.path.join(os.getcwd(), "Werstreamtes.csv")
+        
+        if os.path.exists(imdb_csv):
+            self.file1_path.set(imdb_csv)
+        
+        if os.path.exists(werstreamtes_csv):
+            self.file2_path.set(werstreamtes_csv)
+        
+        # Create main container with padding
+        self.main_frame = ttk.Frame(root, padding="20 20 20 10")
+        self.main_frame.pack(fill=tk.BOTH, expand=True)
+        
+        self.create_widgets()
+    
+    def create_widgets(self):
+        # App title/header
+        header_frame = ttk.Frame(self.main_frame)
+        header_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        ttk.Label(header_frame, text="IMDB Werstreamt.es comparison tool", 
+                  style='Header.TLabel', font=('Helvetica', 14, 'bold')).pack(side=tk.LEFT)
+        
+        # File selection frame
+        file_frame = ttk.LabelFrame(self.main_frame, text="Select Files", padding="10")
+        file_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        # File selection grid with better spacing
+        file_frame.columnconfigure(1, weight=1)
+        
+        # File 1 selection (IMDB)
+        ttk.Label(file_frame, text="IMDB Database:").grid(row=0, column=0, padx=(5, 10), pady=10, sticky=tk.W)
+        entry1 = ttk.Entry(file_frame, textvariable=self.file1_path, width=70)
+        entry1.grid(row=0, column=1, padx=5, pady=10, sticky=tk.EW)
+        browse1_btn = ttk.Button(file_frame, text="Browse...", command=self.browse_file1)
+        browse1_btn.grid(row=0, column=2, padx=(5, 10), pady=10)
+        
+        # File 2 selection (Werstreamtes)
+        ttk.Label(file_frame, text="Werstreamt.es Database:").grid(row=1, column=0, padx=(5, 10), pady=10, sticky=tk.W)
+        entry2 = ttk.Entry(file_frame, textvariable=self.file2_path, width=70)
+        entry2.grid(row=1, column=1, padx=5, pady=10, sticky=tk.EW)
+        browse2_btn = ttk.Button(file_frame, text="Browse...", command=self.browse_file2)
+        browse2_btn.grid(row=1, column=2, padx=(5, 10), pady=10)
+        
+        # Action buttons in a card-like frame
+        self.action_frame = ttk.Frame(self.main_frame, padding="10")
+        self.action_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        # Button container with centered alignment
+        button_container = ttk.Frame(self.action_frame)
+        button_container.pack(pady=5)
+        
+        self.load_btn = ttk.Button(button_container, text="Load & Compare Files", 
+                                   command=self.load_and_compare, style='Action.TButton', width=20)
+        self.load_btn.pack(side=tk.LEFT, padx=10)
+        
+        self.cancel_btn = ttk.Button(button_container, text="Cancel", 
+                                     command=self.cancel_comparison, width=10)
+        self.cancel_btn.pack(side=tk.LEFT, padx=10)
+        self.cancel_btn.state(['disabled'])
+        
+        export_btn = ttk.Button(button_container, text="Export Results", 
+                                command=self.export_results, style='Action.TButton', width=15)
+        export_btn.pack(side=tk.LEFT, padx=10)
+        
+        stats_btn = ttk.Button(button_container, text="Stats", 
+                               command=self.show_stats, width=8)
+        stats_btn.pack(side=tk.LEFT, padx=10)
+        
+        fuzzy_check = ttk.Checkbutton(button_container, text="Fuzzy title matching", 
+                                      variable=self.fuzzy_matching)
+        fuzzy_check.pack(side=tk.LEFT, padx=10)
+        
+        incremental_check = ttk.Checkbutton(button_container, text="Only re-check changed rows", 
+                                            variable=self.incremental)
+        incremental_check.pack(side=tk.LEFT, padx=10)
+        
+        mirror_check = ttk.Checkbutton(button_container, text="Use local catalog mirror", 
+                                       variable=self.use_mirror)
+        mirror_check.pack(side=tk.LEFT, padx=10)
+        
+        # Progress bar (hidden by default)
+        self.progress_frame = ttk.Frame(self.main_frame)
+        self.progress_frame.pack(fill=tk.X, pady=(0, 15))
+        
+        self.progress_label = ttk.Label(self.progress_frame, text="")
+        self.progress_label.pack(fill=tk.X, padx=5, pady=(0, 5))
+        
+        self.progress_bar = ttk.Progressbar(self.progress_frame, mode='determinate', length=300)
+        self.progress_bar.pack(fill=tk.X, padx=5)
+        
+        # Hide progress frame initially
+        self.progress_frame.pack_forget()
+        
+        # Results section with a cleaner title and frame
+        results_frame = ttk.LabelFrame(self.main_frame, text="Missing Movies", padding="10")
+        results_frame.pack(fill=tk.BOTH, expand=True, pady=(0, 10))
+        
+        # Filter bar; every change re-filters the displayed rows right away
+        filter_frame = ttk.Frame(results_frame)
+        filter_frame.pack(fill=tk.X, padx=5, pady=(0, 5))
+        
+        ttk.Label(filter_frame, text="Search:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.search_var, width=30).pack(side=tk.LEFT, padx=(5, 15))
+        
+        ttk.Label(filter_frame, text="Year:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.year_from, width=6).pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Label(filter_frame, text="-").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.year_to, width=6).pack(side=tk.LEFT, padx=(2, 15))
+        
+        ttk.Label(filter_frame, text="Rating:").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.rating_from, width=5).pack(side=tk.LEFT, padx=(5, 2))
+        ttk.Label(filter_frame, text="-").pack(side=tk.LEFT)
+        ttk.Entry(filter_frame, textvariable=self.rating_to, width=5).pack(side=tk.LEFT, padx=(2, 15))
+        
+        self.genre_combo = ttk.Combobox(filter_frame, textvariable=self.genre_var, values=[ALL_GENRES],
+                                        state='readonly', width=15)
+        self.genre_combo.pack(side=tk.LEFT, padx=(0, 15))
+        
+        ttk.Button(filter_frame, text="Clear", command=self.clear_filters, width=8).pack(side=tk.LEFT)
+        ttk.Label(filter_frame, textvariable=self.filter_count_var).pack(side=tk.RIGHT)
+        
+        for var in (self.search_var, self.year_from, self.year_to, self.rating_from, self.rating_to,
+                    self.genre_var):
+            var.trace_add('write', lambda *args: self.apply_filters())
+        
+        # Create frame for the treeview and scrollbar
+        treeview_frame = ttk.Frame(results_frame)
+        treeview_frame.pack(fill=tk.BOTH, expand=True, padx=5, pady=5)
+        
+        # Create treeview for results with fixed columns
+        self.results_treeview = ttk.Treeview(treeview_frame)
+        self.results_treeview.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        
+        # Bind click event for copying cell content
+        self.results_treeview.bind('<Button-1>', self.copy_cell_content)
+        
+        # Create tooltip label for copy feedback
+        self.tooltip = tk.Label(self.root, text="Copied!", 
+                              background='#2e2e2e', foreground='white',
+                              padx=10, pady=5, borderwidth=1, relief='solid')
+        self.tooltip.place_forget()  # Hide initially
+        
+        # Create vertical scrollbar, driven by the virtualized view instead of the treeview
+        scrollbar_y = ttk.Scrollbar(treeview_frame, orient="vertical")
+        scrollbar_y.pack(side=tk.RIGHT, fill=tk.Y)
+        self.results_view = VirtualTreeview(self.results_treeview, scrollbar_y)
+        
+        # Create horizontal scrollbar
+        scrollbar_x = ttk.Scrollbar(results_frame, orient="horizontal", command=self.results_treeview.xview)
+        scrollbar_x.pack(side=tk.BOTTOM, fill=tk.X)
+        
+        # Configure treeview scrollbars
+        self.results_treeview.configure(xscrollcommand=scrollbar_x.set)
+        
+        # Status bar with modern styling
+        status_frame = ttk.Frame(self.main_frame, padding=(0, 5, 0, 0))
+        status_frame.pack(fill=tk.X, side=tk.BOTTOM)
+        
+        self.status_var = tk.StringVar()
+        self.status_var.set("Ready")
+        
+        # Status icon and text
+        status_icon = ttk.Label(status_frame, text="•", font=('Helvetica', 16))
+        status_icon.pack(side=tk.LEFT, padx=(0, 5))
+        
+        status_bar = ttk.Label(status_frame, textvariable=self.status_var, 
+                              anchor=tk.W, padding=(0, 5))
+        status_bar.pack(side=tk.LEFT, fill=tk.X, expand=True)
+        
+        # Load and compare files automatically if default files exist
+        # Removed automatic comparison on startup
+    
+    def browse_file1(self):
+        file_path = filedialog.askopenfilename(
+            title="Select IMDB CSV File",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if file_path:
+            self.file1_path.set(file_path)
+    
+    def browse_file2(self):
+        file_path = filedialog.askopenfilename(
+            title="Select Werstreamt.es CSV File",
+            filetypes=[("CSV files", "*.csv")]
+        )
+        if file_path:
+            self.file2_path.set(file_path)
+    
+    def load_and_compare(self):
+        """Load files and perform comparison on a background worker thread."""
+        # Ignore clicks while a run is already in progress
+        if self.worker is not None and self.worker.is_alive():
+            return
+        
+        # Check if both files are selected
+        if not self.file1_path.get() or not self.file2_path.get():
+            messagebox.showerror("Error", "Please select both CSV files.")
+            return
+        
+        self.cancel_event = threading.Event()
+        self.worker_queue = queue.Queue()
+        self.metrics = Metrics()
+        self.worker = threading.Thread(
+            target=self.run_comparison,
+            args=(self.file1_path.get(), self.file2_path.get(), self.fuzzy_matching.get(),
+                  self.incremental.get(), self.use_mirror.get(), self.worker_queue, self.cancel_event,
+                  self.metrics),
+            daemon=True,
+        )
+        
+        # Show progress bar and swap the action buttons while the worker runs
+        self.load_btn.state(['disabled'])
+        self.cancel_btn.state(['!disabled'])
+        self.progress_frame.pack(fill=tk.X, pady=(0, 15), after=self.action_frame)
+        self.progress_bar['value'] = 0
+        self.progress_label['text'] = "Loading files..."
+        
+        self.worker.start()
+        self.root.after(self.POLL_INTERVAL_MS, self.poll_worker)
+    
+    def cancel_comparison(self):
+        """Ask the running worker to stop after the lookups currently in flight."""
+        if self.worker is not None and self.worker.is_alive():
+            self.cancel_event.set()
+            self.cancel_btn.state(['disabled'])
+            self.progress_label['text'] = "Cancelling..."
+    
+    def open_verification(self, imdb_path, werstreamtes_path, use_mirror, metrics):
+        """Return (engine, cache, mirror) for verifying on the worker thread; mirror is None unless wanted."""
+        cache = VerificationCache(cache_path_for(imdb_path))
+        mirror = None
+        if use_mirror:
+            mirror = CatalogMirror(mirror_path_for(imdb_path))
+            mirror.harvest_cache(cache)
+            mirror.harvest_export(werstreamtes_path)
+        return VerificationEngine(cache=cache, metrics=metrics, mirror=mirror), cache, mirror
+    
+    def close_verification(self, cache, mirror):
+        cache.close()
+        if mirror is not None:
+            mirror.close()
+    
+    def run_comparison(self, imdb_path, werstreamtes_path, fuzzy, incremental, use_mirror, messages, cancel_event,
+                       metrics):
+        """Load, compare and verify on the worker thread, reporting back through messages.
+        
+        Never touches Tk directly; the GUI thread picks the messages up in poll_worker.
+        Stage timings and lookup statistics are recorded in metrics.
+        """
+        try:
+            with metrics.timer('load'):
+                file1_data, file2_data = load_files(imdb_path, werstreamtes_path)
+        except ValueError as e:
+            messages.put(('error', str(e)))
+            return
+        except Exception as e:
+            messages.put(('error', f"Error loading files: {str(e)}"))
+            return
+        messages.put(('loaded', file1_data, file2_data))
+        
+        try:
+            if cancel_event.is_set():
+                raise ComparisonCancelled()
+            
+            with metrics.timer('index'):
+                title_index = TitleIndex(file2_data)
+                fuzzy_matcher = FuzzyTitleMatcher(file2_data) if fuzzy else None
+            if incremental:
+                # Only rows that changed since the last run are matched and verified again
+                engine, cache, mirror = self.open_verification(imdb_path, werstreamtes_path, use_mirror, metrics)
+                try:
+                    with metrics.timer('incremental'):
+                        missing_entries = compare_incremental(
+                            imdb_path, file1_data, werstreamtes_path, title_index, engine, fuzzy_matcher,
+                            lambda done, total: messages.put(('progress', done, total)),
+                            cancel_event,
+                        )
+                finally:
+                    self.close_verification(cache, mirror)
+                messages.put(('done', missing_entries))
+                return
+            
+            # Get the entries that don't exist in werstreamtes
+            with metrics.timer('match'):
+                missing_entries = find_candidates(file1_data, title_index, fuzzy_matcher)
+            messages.put(('status', f"Found {len(missing_entries)} potentially missing entries. "
+                                    "Starting web verification..."))
+            
+            # Verify only entries that have a valid IMDB ID
+            if len(missing_entries) > 0 and 'URL' in missing_entries.columns:
+                if len(entries_to_verify(missing_entries)) > 0:
+                    engine, cache, mirror = self.open_verification(imdb_path, werstreamtes_path, use_mirror,
+                                                                   metrics)
+                    try:
+                        with metrics.timer('verify'):
+                            missing_entries = verify_candidates(
+                                missing_entries, engine,
+                                lambda done, total: messages.put(('progress', done, total)),
+                                cancel_event,
+                            )
+                    finally:
+                        self.close_verification(cache, mirror)
+                else:
+                    messages.put(('warning', "No valid IMDB IDs found in the missing entries."))
+            
+            messages.put(('done', missing_entries))
+        except ComparisonCancelled:
+            messages.put(('cancelled',))
+        except Exception as e:
+            messages.put(('error', f"Error comparing files: {str(e)}"))
+    
+    def poll_worker(self):
+        """Apply messages from the worker thread and reschedule until it has finished."""
+        finished = False
+        try:
+            while True:
+                message = self.worker_queue.get_nowait()
+                kind = message[0]
+                if kind == 'loaded':
+                    self.file1_data, self.file2_data = message[1], message[2]
+                    self.status_var.set(f"Loaded IMDB.csv: {len(self.file1_data)} rows, "
+                                        f"Werstreamtes.csv: {len(self.file2_data)} rows")
+                elif kind == 'status':
+                    self.status_var.set(message[1])
+                elif kind == 'progress':
+                    self.update_progress(message[1], message[2])
+                elif kind == 'warning':
+                    messagebox.showwarning("Warning", message[1])
+                elif kind == 'done':
+                    self.missing_entries = message[1]
+                    with self.metrics.timer('display'):
+                        self.display_results(self.missing_entries)
+                    self.status_var.set(describe_results(self.missing_entries))
+                    finished = True
+                elif kind == 'cancelled':
+                    self.status_var.set("Comparison cancelled")
+                    finished = True
+                elif kind == 'error':
+                    messagebox.showerror("Error", message[1])
+                    finished = True
+        except queue.Empty:
+            pass
+        
+        if finished or (not self.worker.is_alive() and self.worker_queue.empty()):
+            self.finish_comparison()
+        else:
+            self.root.after(self.POLL_INTERVAL_MS, self.poll_worker)
+    
+    def finish_comparison(self):
+        """Hide the progress bar and re-enable the action buttons."""
+        self.progress_frame.pack_forget()
+        self.load_btn.state(['!disabled'])
+        self.cancel_btn.state(['disabled'])
+    
+    def update_progress(self, done, total):
+        """Show verification progress."""
+        self.progress_bar['maximum'] = total
+        self.progress_bar['value'] = done
+        self.progress_label['text'] = f"Verifying entries... ({done}/{total})"
+    
+    def display_results(self, data):
+        # If no data, clear previous rows and show a message
+        if len(data) == 0:
+            self.results_filter = None
+            self.filter_count_var.set("")
+            self.results_view.set_rows(format_rows(data, []))
+            self.status_var.set("No missing entries found")
+            return
+        
+        # Filter columns to display that exist in the data
+        valid_columns = [col for col in DISPLAY_COLUMNS if col in data.columns]
+        
+        # Configure columns
+        self.results_treeview['columns'] = valid_columns
+        self.results_treeview.column('#0', width=0, stretch=tk.NO)  # Hide the first column
+        
+        # Configure column headings
+        for col in valid_columns:
+            if col in ['Title', 'Original Title']:
+                width = 200
+            elif col == 'URL':
+                width = 300
+            elif col == 'IMDB ID':
+                width = 100
+            else:
+                width = 100
+            self.results_treeview.column(col, anchor="w", width=width)
+            self.results_treeview.heading(col, text=col, anchor="w", command=lambda c=col: self.sort_by(c))
+        
+        # Only the visible rows become Treeview items; the rest are rendered on scroll
+        self.results_view.set_rows(format_rows(data, valid_columns))
+        
+        # Index the new results, keeping the filters that were typed in
+        self.results_filter = ResultsFilter(data)
+        self.genre_combo['values'] = [ALL_GENRES] + self.results_filter.genres
+        if self.genre_var.get() not in self.genre_combo['values']:
+            self.genre_var.set(ALL_GENRES)
+        if self.sort_column not in valid_columns:
+            self.sort_column = None
+        self.update_sort_headings()
+        self.apply_filters()
+        
+        # Configure row colors
+        self.results_treeview.tag_configure('odd', background='#f5f5f5')
+        self.results_treeview.tag_configure('even', background='#ffffff')
+    
+    def apply_filters(self):
+        """Show the rows matching the filter bar, in the selected sort order."""
+        if self.results_filter is None:
+            return
+        genre = self.genre_var.get()
+        positions = self.results_filter.apply(
+            self.search_var.get(),
+            year=(parse_bound(self.year_from.get()), parse_bound(self.year_to.get())),
+            rating=(parse_bound(self.rating_from.get()), parse_bound(self.rating_to.get())),
+            genre=None if genre == ALL_GENRES else genre,
+            sort_column=self.sort_column,
+            descending=self.sort_descending,
+        )
+        self.results_view.show(positions)
+        self.filter_count_var.set(f"Showing {len(positions)} of {len(self.results_filter)}")
+    
+    def clear_filters(self):
+        for var in (self.search_var, self.year_from, self.year_to, self.rating_from, self.rating_to):
+            var.set("")
+        self.genre_var.set(ALL_GENRES)
+    
+    def sort_by(self, column):
+        """Sort by the clicked column heading; clicking it again reverses the order."""
+        if self.sort_column == column:
+            self.sort_descending = not self.sort_descending
+        else:
+            self.sort_column = column
+            self.sort_descending = False
+        self.update_sort_headings()
+        self.apply_filters()
+    
+    def update_sort_headings(self):
+        """Mark the sorted column's heading with the sort direction."""
+        for col in self.results_treeview['columns']:
+            text = col
+            if col == self.sort_column:
+                text += " \u25bc" if self.sort_descending else " \u25b2"
+            self.results_treeview.heading(col, text=text)
+    
+    def copy_cell_content(self, event):
+        """Copy the content of the clicked cell to clipboard."""
+        try:
+            # Get the clicked item and column
+            item_id = self.results_treeview.identify_row(event.y)
+            column = self.results_treeview.identify_column(event.x)
+            
+            if not item_id or not column:
+                return
+            
+            # Get column name from column number (e.g., '#1', '#2', etc.)
+            column_num = int(column.replace('#', '')) - 1
+            if column_num < 0:  # Clicked on the first hidden column
+                return
+                
+            column_names = self.results_treeview['columns']
+            if column_num >= len(column_names):
+                return
+                
+            # Get the value from the cell
+            value = self.results_treeview.item(item_id)['values'][column_num]
+            if value:  # Only copy if there's content
+                # Convert to string if it's not already
+                value_str = str(value)
+                
+                # Copy to clipboard
+                self.root.clipboard_clear()
+                self.root.clipboard_append(value_str)
+                self.root.update()  # Required for clipboard
+                
+                # Show tooltip near mouse cursor
+                self.show_copy_tooltip(event.x_root, event.y_root, column_names[column_num])
+        except Exception as e:
+            print(f"Error copying cell content: {str(e)}")
+    
+    def show_copy_tooltip(self, x, y, column_name):
+        """Show a tooltip indicating the content was copied."""
+        # Hide any existing tooltip
+        self.tooltip.place_forget()
+        
+        # Update tooltip text
+        self.tooltip['text'] = f"{column_name} copied!"
+        
+        # Position tooltip near mouse cursor but slightly offset
+        self.tooltip.place(x=x + 15, y=y - 30)
+        
+        # Schedule tooltip to disappear
+        self.root.after(1500, self.tooltip.place_forget)
+    
+    def show_stats(self):
+        """Show the timings and lookup statistics of the last comparison in a separate window."""
+        if self.metrics is None:
+            messagebox.showinfo("No Data", "Run a comparison first to collect statistics.")
+            return
+        
+        snapshot = self.metrics.snapshot()
+        lines = ["Stage timings:"]
+        for stage, seconds in snapshot['stages_seconds'].items():
+            lines.append(f"  {stage:<12} {seconds:8.3f} s")
+        
+        lines.append("")
+        lines.append("Counters:")
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f"  {name:<20} {value}")
+        ratio = snapshot['cache_hit_ratio']
+        lines.append(f"  {'cache_hit_ratio':<20} {'-' if ratio is None else f'{ratio:.1%}'}")
+        
+        latency = snapshot['request_latency']
+        lines.append("")
+        lines.append(f"Request latency ({latency['count']} requests):")
+        for bound, count in latency['buckets'].items():
+            lines.append(f"  <= {bound:<6} s  {count}")
+        if latency['count']:
+            lines.append(f"  mean      {latency['sum_seconds'] / latency['count']:.3f} s")
+        
+        window = tk.Toplevel(self.root)
+        window.title("Comparison statistics")
+        text = tk.Text(window, width=50, height=min(40, len(lines) + 1), font=('Courier', 10))
+        text.insert('1.0', "\n".join(lines))
+        text.configure(state='disabled')
+        text.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+    
+    def export_results(self):
+        # Check if there's data to export
+        if self.missing_entries is None or len(self.missing_entries) == 0:
+            messagebox.showinfo("No Data", "There is no data to export.")
+            return
+        
+        # Ask for file location
+        file_path = filedialog.asksaveasfilename(
+            defaultextension=".csv",
+            filetypes=[("CSV files", "*.csv"), ("JSON Lines files", "*.jsonl"), ("Parquet files", "*.parquet")],
+            initialfile="missing_movies.csv",
+            title="Export Missing Movies"
+        )
+        
+        if not file_path:
+            return
+        
+        try:
+            # Export data in the format given by the file extension
+            write_results(self.missing_entries, file_path)
+            messagebox.showinfo("Success", f"Data exported to {file_path}")
+        except Exception as e:
+            messagebox.showerror("Error", f"Error exporting data: {str(e)}")
+
+
+def main():
+    """Start the Tk user interface."""
+    root = tk.Tk()
+    # Set application icon (if available)
+    try:
+        root.iconbitmap("appicon.ico")
+    except:
+        pass
+    app = CSVComparatorApp(root)
+    root.mainloop()
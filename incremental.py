@@ -0,0 +1,164 @@
+"""Incremental comparison that only re-matches and re-verifies rows that changed since the last run."""
+import os
+import time
+
+import pandas as pd
+
+from comparison import (ComparisonCancelled, entries_to_verify, extract_imdb_ids, find_candidates, format_imdb_ids,
+                        verify_ids)
+from snapshot import file_fingerprint
+from verification_cache import DEFAULT_FOUND_TTL, DEFAULT_MISSING_TTL
+from verifier import FOUND, MISSING, UNKNOWN
+
+STATE_FILENAME = "werstreamtes_state.pkl"
+STATE_VERSION = 6
+
+# Row outcomes besides the verification verdicts
+MATCHED = "matched"            # Title found in the Werstreamt.es export
+UNVERIFIABLE = "unverifiable"  # Not matched and without an IMDB ID to verify
+
+# Columns of the saved rows besides their title keys
+STATE_COLUMNS = ['row_hash', 'outcome', 'checked_at']
+
+
+def state_path_for(imdb_path):
+    """Return the incremental state path that lives next to the IMDB CSV."""
+    return os.path.join(os.path.dirname(os.path.abspath(imdb_path)), STATE_FILENAME)
+
+
+def load_state(path):
+    """Return the state saved by the previous run, or None if there is no usable one."""
+    try:
+        state = pd.read_pickle(path)
+    except Exception:
+        return None
+    if not isinstance(state, dict) or state.get('version') != STATE_VERSION:
+        return None
+    return state
+
+
+def state_keys(imdb_ids):
+    """Return the state key of each row: its IMDB ID and how many rows before it have the same ID.
+
+    Keying by occurrence keeps every row with a repeated IMDB ID in the
+    state, so unchanged duplicates are reused like any other row.
+    """
+    occurrences = imdb_ids.groupby(imdb_ids).cumcount().fillna(-1).astype('int64')
+    return pd.MultiIndex.from_arrays([imdb_ids, occurrences], names=['imdb_id', 'occurrence'])
+
+
+def verdict_ttls(engine):
+    """Return how long MISSING and FOUND outcomes may be reused, matching the engine's cache."""
+    if engine.cache is None:
+        return {MISSING: DEFAULT_MISSING_TTL, FOUND: DEFAULT_FOUND_TTL}
+    return {MISSING: engine.cache.missing_ttl, FOUND: engine.cache.found_ttl}
+
+
+def compare_incremental(imdb_path, imdb_data, werstreamtes_path, title_index, engine, fuzzy_matcher=None,
+                        progress=None, cancel_event=None, state_path=None):
+    """Return the missing entries like find_candidates and verify_candidates would.
+
+    Rows are diffed by IMDB ID, and by occurrence for IDs listed more than
+    once, against the previous run's state. Only rows
+    that are new or changed, rows whose title keys were added to or removed
+    from the Werstreamt.es export, rows whose lookup failed last time, and
+    rows whose verdict is older than the cache's TTL for it are matched and
+    verified again; all other rows reuse their previous outcome. The state
+    is saved next to the IMDB CSV for the next run.
+    """
+    if state_path is None:
+        state_path = state_path_for(imdb_path)
+    settings = (title_index.use_year, fuzzy_matcher.threshold if fuzzy_matcher is not None else None)
+    werstreamtes_fingerprint = file_fingerprint(werstreamtes_path)
+    now = time.time()
+
+    imdb_ids = extract_imdb_ids(imdb_data['URL']) if 'URL' in imdb_data.columns \
+        else pd.Series(pd.NA, index=imdb_data.index, dtype='UInt32')
+    row_keys = state_keys(imdb_ids)
+    row_hashes = pd.util.hash_pandas_object(imdb_data, index=False)
+
+    # Find the rows that can reuse the outcome of the previous run
+    previous = load_state(state_path)
+    reuse = pd.Series(False, index=imdb_data.index)
+    if previous is not None and previous['settings'] == settings:
+        rows = previous['rows']
+        known = imdb_ids.notna() & row_keys.isin(rows.index)
+        previous_rows = rows.reindex(row_keys[known.to_numpy()])
+        previous_rows.index = imdb_ids.index[known]
+        unchanged = previous_rows['row_hash'].to_numpy() == row_hashes[known].to_numpy()
+        # A title missing today may be added tomorrow, so verdicts expire like cached ones
+        ttl = previous_rows['outcome'].map(verdict_ttls(engine)).astype(float)
+        expired = (now - previous_rows['checked_at'] >= ttl).to_numpy()
+        reuse[known] = unchanged & (previous_rows['outcome'] != UNKNOWN).to_numpy() & ~expired
+
+        if previous['werstreamtes_fingerprint'] != werstreamtes_fingerprint:
+            if fuzzy_matcher is not None:
+                # Any Werstreamt.es change can move a fuzzy match, so re-match everything
+                reuse[:] = False
+            else:
+                changed_keys = previous['title_keys'].symmetric_difference(title_index.keys)
+                key_columns = previous_rows.drop(columns=STATE_COLUMNS)
+                affected = key_columns.isin(changed_keys).any(axis=1).to_numpy()
+                reuse[known] &= ~affected
+    else:
+        previous_rows = None
+
+    # Match and verify only the remaining rows
+    outcomes = pd.Series(MATCHED, index=imdb_data.index, dtype=object)
+    checked_at = pd.Series(float('nan'), index=imdb_data.index)
+    key_parts = []
+    if reuse.any():
+        reused = previous_rows.loc[reuse[reuse].index]
+        outcomes[reused.index] = reused['outcome']
+        checked_at[reused.index] = reused['checked_at']
+        key_parts.append(reused.drop(columns=STATE_COLUMNS).astype(object))
+
+    redo_rows = imdb_data[~reuse]
+    if len(redo_rows) > 0:
+        key_parts.append(title_index.row_keys(redo_rows).astype(object))
+        candidates = find_candidates(redo_rows, title_index, fuzzy_matcher)
+        outcomes[candidates.index] = UNVERIFIABLE
+        to_verify = entries_to_verify(candidates)
+        if len(to_verify) > 0:
+            verdicts = verify_ids(to_verify['IMDB ID'], engine, progress, cancel_event)
+            outcomes[to_verify.index] = to_verify['IMDB ID'].map(verdicts)
+            checked_at[to_verify.index] = now
+    keys = pd.concat(key_parts).reindex(imdb_data.index) if key_parts else pd.DataFrame(index=imdb_data.index)
+    if cancel_event is not None and cancel_event.is_set():
+        raise ComparisonCancelled()
+
+    save_state(state_path, row_keys, row_hashes, outcomes, checked_at, keys, title_index, settings,
+               werstreamtes_fingerprint)
+
+    # As in a full run, unverifiable rows are only reported when nothing could be verified
+    if outcomes.isin([MISSING, FOUND, UNKNOWN]).any():
+        missing_mask = outcomes.isin([MISSING, UNKNOWN])
+    else:
+        missing_mask = outcomes == UNVERIFIABLE
+    missing_entries = imdb_data[missing_mask].copy()
+    if 'URL' in missing_entries.columns:
+        missing_entries['IMDB ID'] = format_imdb_ids(imdb_ids[missing_mask])
+        if outcomes.isin([MISSING, UNKNOWN]).any():
+            missing_entries['Verification'] = outcomes[missing_mask]
+    return missing_entries
+
+
+def save_state(path, row_keys, row_hashes, outcomes, checked_at, keys, title_index, settings,
+               werstreamtes_fingerprint):
+    """Write the state of this run, keyed by state_keys, for the next incremental run."""
+    rows = keys.copy()
+    rows['row_hash'] = row_hashes
+    rows['outcome'] = outcomes
+    rows['checked_at'] = checked_at
+    rows.index = row_keys
+    rows = rows[row_keys.get_level_values('imdb_id').notna()]
+    state = {
+        'version': STATE_VERSION,
+        'settings': settings,
+        'werstreamtes_fingerprint': werstreamtes_fingerprint,
+        'title_keys': title_index.keys,
+        'rows': rows,
+    }
+    temp_path = path + ".tmp"
+    pd.to_pickle(state, temp_path)
+    os.replace(temp_path, path)
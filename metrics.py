@@ -0,0 +1,115 @@
+"""Per-run timing and counters for the comparison pipeline."""
+import json
+import math
+import threading
+import time
+from contextlib import contextmanager, nullcontext
+
+# Upper bounds in seconds of the request latency histogram buckets
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, math.inf)
+
+
+class Metrics:
+    """Collect stage timers, request latencies and counters of one run. Thread-safe."""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages = {}
+        self.counters = {}
+        self.latency_buckets = [0] * len(LATENCY_BUCKETS)
+        self.latency_sum = 0.0
+        self.latency_count = 0
+
+    @contextmanager
+    def timer(self, stage):
+        """Time the wrapped block and add it to the stage's total."""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            with self._lock:
+                self.stages[stage] = self.stages.get(stage, 0.0) + elapsed
+
+    def increment(self, name, value=1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def observe_latency(self, seconds):
+        """Record the duration of one HTTP request."""
+        with self._lock:
+            for i, bound in enumerate(LATENCY_BUCKETS):
+                if seconds <= bound:
+                    self.latency_buckets[i] += 1
+                    break
+            self.latency_sum += seconds
+            self.latency_count += 1
+
+    def cache_hit_ratio(self):
+        hits = self.counters.get('cache_hits', 0)
+        lookups = hits + self.counters.get('cache_misses', 0)
+        return hits / lookups if lookups else None
+
+    def snapshot(self):
+        """Return all metrics as a JSON-serializable dict."""
+        with self._lock:
+            return {
+                'stages_seconds': dict(self.stages),
+                'counters': dict(self.counters),
+                'cache_hit_ratio': self.cache_hit_ratio(),
+                'request_latency': {
+                    'buckets': {('+Inf' if math.isinf(bound) else str(bound)): count
+                                for bound, count in zip(LATENCY_BUCKETS, self.latency_buckets)},
+                    'sum_seconds': self.latency_sum,
+                    'count': self.latency_count,
+                },
+            }
+
+    def to_json(self):
+        return json.dumps(self.snapshot(), indent=2)
+
+    def to_prometheus(self, prefix='werstreamtes'):
+        """Return the metrics in the Prometheus text exposition format."""
+        snapshot = self.snapshot()
+        lines = [f'# TYPE {prefix}_stage_seconds gauge']
+        for stage, seconds in sorted(snapshot['stages_seconds'].items()):
+            lines.append(f'{prefix}_stage_seconds{{stage="{stage}"}} {seconds}')
+        for name, value in sorted(snapshot['counters'].items()):
+            lines.append(f'# TYPE {prefix}_{name}_total counter')
+            lines.append(f'{prefix}_{name}_total {value}')
+        if snapshot['cache_hit_ratio'] is not None:
+            lines.append(f'# TYPE {prefix}_cache_hit_ratio gauge')
+            lines.append(f'{prefix}_cache_hit_ratio {snapshot["cache_hit_ratio"]}')
+
+        latency = snapshot['request_latency']
+        lines.append(f'# TYPE {prefix}_request_seconds histogram')
+        cumulative = 0
+        for bound, count in latency['buckets'].items():
+            cumulative += count
+            lines.append(f'{prefix}_request_seconds_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{prefix}_request_seconds_sum {latency["sum_seconds"]}')
+        lines.append(f'{prefix}_request_seconds_count {latency["count"]}')
+        return '\n'.join(lines) + '\n'
+
+    def write(self, path):
+        """Write the metrics to path, as Prometheus text for .prom files and JSON otherwise."""
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(self.to_prometheus() if path.endswith('.prom') else self.to_json())
+
+
+class NullMetrics:
+    """Metrics stand-in used when instrumentation is disabled; every call is a no-op."""
+
+    _null_timer = nullcontext()
+
+    def timer(self, stage):
+        return self._null_timer
+
+    def increment(self, name, value=1):
+        pass
+
+    def observe_latency(self, seconds):
+        pass
+
+
+NULL_METRICS = NullMetrics()
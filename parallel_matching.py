@@ -0,0 +1,102 @@
+"""Exact title matching spread over a pool of worker processes, for catalogs of millions of rows."""
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from title_index import imdb_row_keys
+
+# Rows handed to a worker at a time; big enough that pickling the chunk is cheap next to normalizing it
+CHUNK_ROWS = 50000
+
+# IMDB columns the workers need to build the lookup keys
+KEY_COLUMNS = ['Title', 'Original Title', 'Year']
+
+# Set in each worker process by _init_worker
+_worker_hashes = None
+_worker_use_year = False
+
+
+def hash_keys(keys):
+    """Return the 64-bit hashes of an array of normalized keys."""
+    return pd.util.hash_array(np.asarray(keys, dtype=object), categorize=False)
+
+
+def _init_worker(hashes_path, use_year):
+    global _worker_hashes, _worker_use_year
+    # Memory-mapped, so every worker shares the same pages of the page cache
+    _worker_hashes = np.load(hashes_path, mmap_mode='r')
+    _worker_use_year = use_year
+
+
+def _match_chunk(chunk):
+    """Return the match mask of one chunk of IMDB rows against the worker's index."""
+    row_keys = imdb_row_keys(chunk, _worker_use_year)
+    keys = row_keys.to_numpy(dtype=object).ravel(order='F')
+    hashes = hash_keys(keys)
+    positions = np.searchsorted(_worker_hashes, hashes).clip(max=len(_worker_hashes) - 1)
+    found = (_worker_hashes[positions] == hashes) & pd.notna(keys)
+    return np.logical_or.reduce(found.reshape(row_keys.shape[1], len(row_keys)), axis=0)
+
+
+class ParallelTitleMatcher:
+    """Match IMDB rows against a TitleIndex on a process pool.
+
+    The index keys are hashed into a sorted array that is saved once and
+    memory-mapped read-only by every worker. The IMDB frame is split into
+    chunks of chunk_rows, each worker normalizes and looks up its chunks,
+    and the masks are concatenated back in row order. Inputs that fit in a
+    single chunk are matched in this process. Keys are compared by their
+    64-bit hash, so a false match would need a hash collision.
+
+    Has the same match() as TitleIndex, so it can be passed to
+    find_candidates in its place. Use as a context manager, or call close()
+    to stop the workers and remove the hash file.
+    """
+
+    def __init__(self, title_index, workers=None, chunk_rows=CHUNK_ROWS):
+        self.title_index = title_index
+        self.workers = workers or os.cpu_count() or 1
+        self.chunk_rows = chunk_rows
+        self._directory = None
+        self._executor = None
+
+    def _start(self):
+        self._directory = tempfile.mkdtemp(prefix='werstreamtes_index_')
+        hashes_path = os.path.join(self._directory, 'keys.npy')
+        hashes = np.unique(hash_keys(self.title_index.keys.to_numpy(dtype=object)))
+        if len(hashes) == 0:
+            # searchsorted needs something to compare against; no real key hashes to this
+            hashes = np.array([np.iinfo(np.uint64).max], dtype=np.uint64)
+        np.save(hashes_path, hashes)
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker,
+                                             initargs=(hashes_path, self.title_index.use_year))
+
+    def match(self, imdb_data, row_keys=None):
+        """Return a boolean array marking the IMDB rows found on Werstreamt.es."""
+        if row_keys is not None or self.workers < 2 or len(imdb_data) <= self.chunk_rows:
+            return self.title_index.match(imdb_data, row_keys)
+        if self._executor is None:
+            self._start()
+
+        data = imdb_data[[col for col in KEY_COLUMNS if col in imdb_data.columns]]
+        chunks = (data.iloc[start:start + self.chunk_rows] for start in range(0, len(data), self.chunk_rows))
+        # map() yields the results in submission order, whatever order the workers finish in
+        return np.concatenate(list(self._executor.map(_match_chunk, chunks)))
+
+    def close(self):
+        if self._executor is not None:
+            self._executor.shutdown()
+            self._executor = None
+        if self._directory is not None:
+            shutil.rmtree(self._directory, ignore_errors=True)
+            self._directory = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
@@ -0,0 +1,168 @@
+"""Search, filter and sort the results table on precomputed indexes, without touching the data frame."""
+import numpy as np
+import pandas as pd
+
+from title_index import COMBINING_MARKS_RE
+
+# Columns searched by the free-text filter
+SEARCH_COLUMNS = ['Title', 'Original Title']
+
+
+def search_texts(titles):
+    """Return titles casefolded and without accents, so "amelie" finds "Amélie"."""
+    return (
+        titles.astype('string')
+        .str.normalize('NFKD')
+        .str.replace(COMBINING_MARKS_RE, '', regex=True)
+        .str.casefold()
+        .fillna('')
+    )
+
+
+def trigram_codes(text):
+    """Return the trigrams of a string packed into int64 codes, 21 bits per code point."""
+    codes = np.frombuffer(text.encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+    if len(codes) < 3:
+        return codes[:0]
+    return (codes[:-2] << 42) | (codes[1:-1] << 21) | codes[2:]
+
+
+def trigram_postings(texts):
+    """Build an inverted index from trigram to the positions of the texts containing it.
+
+    Returns (grams, offsets, rows) in compressed form: the rows holding
+    grams[i] are rows[offsets[i]:offsets[i + 1]], in ascending order. All
+    texts are encoded as one buffer, so building it costs a few vectorized
+    passes and a single sort instead of a Python loop per trigram.
+    """
+    lengths = np.fromiter((len(text) + 1 for text in texts), dtype=np.int64, count=len(texts))
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    grams = trigram_codes('\n'.join(texts))
+    # Drop trigrams spanning a line break, which no query can contain
+    newline = ord('\n')
+    valid = (((grams >> 42) != newline) & (((grams >> 21) & 0x1FFFFF) != newline)
+             & ((grams & 0x1FFFFF) != newline))
+    positions = np.flatnonzero(valid)
+    grams = grams[valid]
+    rows = np.searchsorted(starts, positions, side='right') - 1
+
+    # A stable sort keeps each gram's rows ascending; then drop repeats within a row
+    order = np.argsort(grams, kind='stable')
+    grams, rows = grams[order], rows[order]
+    keep = np.ones(len(grams), dtype=bool)
+    keep[1:] = (grams[1:] != grams[:-1]) | (rows[1:] != rows[:-1])
+    grams, rows = grams[keep], rows[keep]
+
+    unique_grams, offsets = np.unique(grams, return_index=True)
+    return unique_grams, np.append(offsets, len(grams)), rows
+
+
+class ResultsFilter:
+    """Indexes over a results DataFrame answering filter and sort queries with row positions.
+
+    Built once per result set: a trigram inverted index over the searched
+    titles, numeric Year and IMDb Rating arrays, a row mask per genre, and
+    sort orders that are computed the first time a column is sorted by. A
+    query then only intersects postings and masks, so it takes milliseconds
+    even for a hundred thousand rows.
+    """
+
+    def __init__(self, data):
+        self.data = data
+        texts = [search_texts(data[col]) for col in SEARCH_COLUMNS if col in data.columns]
+        texts = texts[0].str.cat(texts[1:], sep='\n') if texts else pd.Series('', index=data.index)
+        self._texts = texts.to_numpy(dtype=object)
+
+        self._grams, self._offsets, self._rows = trigram_postings(self._texts)
+
+        self._numbers = {}
+        for col in ('Year', 'IMDb Rating'):
+            if col in data.columns:
+                self._numbers[col] = pd.to_numeric(data[col], errors='coerce').to_numpy(dtype=float,
+                                                                                          na_value=np.nan)
+
+        self._genres = {}
+        if 'Genres' in data.columns:
+            genres = (data['Genres'].astype('string').fillna('')
+                      .str.replace(r'\s*,\s*', ',', regex=True).str.strip().str.get_dummies(sep=','))
+            # Rows without genres would show up as a blank genre
+            genres = genres.drop(columns='', errors='ignore')
+            self._genres = {genre: genres[genre].to_numpy(dtype=bool) for genre in genres.columns}
+        self._orders = {}
+
+    def __len__(self):
+        return len(self.data)
+
+    @property
+    def genres(self):
+        """All genres occurring in the results, sorted."""
+        return sorted(self._genres)
+
+    def search_mask(self, query):
+        """Return a boolean mask of the rows whose titles contain query, ignoring case and accents."""
+        query = search_texts(pd.Series([query])).iloc[0].strip()
+        if not query:
+            return np.ones(len(self.data), dtype=bool)
+        mask = np.zeros(len(self.data), dtype=bool)
+        if len(query) < 3:
+            # Too short for trigrams; scanning the precomputed texts is still fast
+            mask[:] = [query in text for text in self._texts]
+            return mask
+
+        # Rows holding every trigram of the query, rarest first, confirmed with a substring test
+        postings = sorted((self._postings(gram) for gram in np.unique(trigram_codes(query))), key=len)
+        rows = postings[0]
+        for other in postings[1:]:
+            if len(rows) == 0:
+                break
+            rows = np.intersect1d(rows, other, assume_unique=True)
+        mask[[row for row in rows if query in self._texts[row]]] = True
+        return mask
+
+    def _postings(self, gram):
+        i = np.searchsorted(self._grams, gram)
+        if i == len(self._grams) or self._grams[i] != gram:
+            return self._rows[:0]
+        return self._rows[self._offsets[i]:self._offsets[i + 1]]
+
+    def range_mask(self, column, low=None, high=None):
+        """Return a mask of the rows whose column lies within [low, high]; rows without a value never match."""
+        values = self._numbers.get(column)
+        if values is None or (low is None and high is None):
+            return np.ones(len(self.data), dtype=bool)
+        mask = ~np.isnan(values)
+        if low is not None:
+            mask &= values >= low
+        if high is not None:
+            mask &= values <= high
+        return mask
+
+    def genre_mask(self, genre):
+        """Return a mask of the rows tagged with genre, or of all rows if genre is None."""
+        if genre is None:
+            return np.ones(len(self.data), dtype=bool)
+        return self._genres.get(genre, np.zeros(len(self.data), dtype=bool))
+
+    def order(self, column, descending=False):
+        """Return the row positions sorted by column, with empty values last. Cached per column."""
+        key = (column, descending)
+        if key not in self._orders:
+            if column in self._numbers:
+                values = pd.Series(self._numbers[column])
+            else:
+                values = search_texts(self.data[column]).reset_index(drop=True).replace('', pd.NA)
+            self._orders[key] = values.sort_values(ascending=not descending, na_position='last',
+                                                   kind='stable').index.to_numpy()
+        return self._orders[key]
+
+    def apply(self, query='', year=(None, None), rating=(None, None), genre=None, sort_column=None,
+              descending=False):
+        """Return the positions of the rows matching all filters, in display order."""
+        mask = self.search_mask(query)
+        mask &= self.range_mask('Year', *year)
+        mask &= self.range_mask('IMDb Rating', *rating)
+        mask &= self.genre_mask(genre)
+        if sort_column is None or sort_column not in self.data.columns:
+            return np.flatnonzero(mask)
+        order = self.order(sort_column, descending)
+        return order[mask[order]]
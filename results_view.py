@@ -0,0 +1,129 @@
+"""Virtualized results table that only keeps the visible rows as Treeview items."""
+import math
+
+import numpy as np
+import pandas as pd
+from tkinter import ttk
+
+# Columns shown in the results table, in display order, if the data has them
+DISPLAY_COLUMNS = ['IMDB ID', 'Title', 'Original Title', 'Year', 'IMDb Rating', 'Genres', 'URL', 'Verification']
+
+
+def format_rows(data, columns):
+    """Return the display strings for the given columns as a 2D object array.
+
+    Formatting is done column by column with vectorized operations; missing
+    values become empty strings and Year is shown without decimal places.
+    """
+    formatted = []
+    for col in columns:
+        values = data[col]
+        if col == 'Year':
+            values = pd.to_numeric(values, errors='coerce').astype('Int64')
+        formatted.append(values.astype('string').fillna('').to_numpy(dtype=object))
+    if not formatted:
+        return np.empty((len(data), 0), dtype=object)
+    return np.column_stack(formatted)
+
+
+class VirtualTreeview:
+    """Drive a ttk.Treeview and its vertical scrollbar over a large table of rows.
+
+    Only the rows that fit in the widget plus BUFFER_ROWS exist as Treeview
+    items. Scrolling rewrites the values of those items in place instead of
+    creating one item per row, so showing a hundred thousand rows costs the
+    same as showing fifty. show() narrows and reorders the displayed rows to
+    a subset of positions, which re-renders just the visible window too.
+    """
+
+    BUFFER_ROWS = 5
+
+    def __init__(self, treeview, scrollbar):
+        self.treeview = treeview
+        self.scrollbar = scrollbar
+        self.rows = np.empty((0, 0), dtype=object)
+        self.positions = None  # Displayed row positions, None for all rows in order
+        self.first = 0
+        self._items = []
+
+        self.scrollbar.configure(command=self.yview)
+        self.treeview.bind('<Configure>', lambda event: self.render())
+        self.treeview.bind('<MouseWheel>', self.on_mousewheel)
+        self.treeview.bind('<Button-4>', lambda event: self.scroll(-3))
+        self.treeview.bind('<Button-5>', lambda event: self.scroll(3))
+
+    def __len__(self):
+        return len(self.rows) if self.positions is None else len(self.positions)
+
+    def set_rows(self, rows):
+        """Replace the table contents with a 2D array of pre-formatted values."""
+        self.rows = rows
+        self.positions = None
+        self.first = 0
+        self.render()
+
+    def show(self, positions):
+        """Display only the rows at the given positions, in that order; None shows all rows."""
+        self.positions = positions
+        self.first = 0
+        self.treeview.selection_remove(self.treeview.selection())
+        self.render()
+
+    def visible_count(self):
+        """Return how many rows fit into the widget at its current height."""
+        row_height = int(ttk.Style().lookup('Treeview', 'rowheight') or 20)
+        return max(1, math.ceil(self.treeview.winfo_height() / row_height))
+
+    def max_first(self):
+        return max(0, len(self) - self.visible_count() + 1)
+
+    def render(self):
+        """Show the rows starting at self.first, reusing the existing items."""
+        self.first = min(max(0, self.first), self.max_first())
+        count = min(len(self) - self.first, self.visible_count() + self.BUFFER_ROWS)
+        count = max(0, count)
+
+        for slot in range(count):
+            position = self.first + slot
+            row = position if self.positions is None else self.positions[position]
+            values = tuple(self.rows[row])
+            # Tag by position so the stripes stay correct whatever the source index
+            tags = ('even' if position % 2 == 0 else 'odd',)
+            if slot < len(self._items):
+                self.treeview.item(self._items[slot], values=values, tags=tags)
+            else:
+                self._items.append(self.treeview.insert('', 'end', values=values, tags=tags))
+
+        if len(self._items) > count:
+            self.treeview.delete(*self._items[count:])
+            del self._items[count:]
+
+        self.treeview.yview_moveto(0)
+        if len(self) == 0:
+            self.scrollbar.set(0, 1)
+        else:
+            visible = self.visible_count() - 1
+            self.scrollbar.set(self.first / len(self),
+                               min(1.0, (self.first + visible) / len(self)))
+
+    def scroll(self, rows):
+        """Scroll by the given number of rows and return 'break' to stop the default binding."""
+        self.first += rows
+        self.treeview.selection_remove(self.treeview.selection())
+        self.render()
+        return 'break'
+
+    def on_mousewheel(self, event):
+        return self.scroll(-3 if event.delta > 0 else 3)
+
+    def yview(self, *args):
+        """Scrollbar command, mirroring the Tk yview protocol."""
+        if args[0] == 'moveto':
+            self.first = int(float(args[1]) * len(self))
+            self.treeview.selection_remove(self.treeview.selection())
+            self.render()
+        elif args[0] == 'scroll':
+            amount = int(args[1])
+            if args[2] == 'pages':
+                amount *= max(1, self.visible_count() - 1)
+            self.scroll(amount)
@@ -0,0 +1,119 @@
+"""Typed, column-pruned CSV loading with a columnar snapshot that is reused while the CSV is unchanged."""
+import json
+import os
+
+import numpy as np
+import pandas as pd
+
+try:
+    import pyarrow  # noqa: F401
+    HAVE_PYARROW = True
+except ImportError:
+    HAVE_PYARROW = False
+
+SNAPSHOT_DIR = ".werstreamtes_snapshots"
+SNAPSHOT_VERSION = 3
+
+
+def file_fingerprint(path):
+    """Return (size, mtime) of a file, which changes whenever the file is rewritten."""
+    stat = os.stat(path)
+    return stat.st_size, stat.st_mtime_ns
+
+
+def snapshot_paths(csv_path):
+    """Return the (data, metadata) paths of the snapshot belonging to a CSV file."""
+    directory = os.path.join(os.path.dirname(os.path.abspath(csv_path)), SNAPSHOT_DIR)
+    name = os.path.basename(csv_path)
+    suffix = ".parquet" if HAVE_PYARROW else ".pkl"
+    return os.path.join(directory, name + suffix), os.path.join(directory, name + ".json")
+
+
+def is_numeric(dtype):
+    return pd.api.types.is_numeric_dtype(pd.api.types.pandas_dtype(dtype))
+
+
+def to_numeric(values, dtype):
+    """Convert values to a numeric dtype, with NA where a value isn't a number or doesn't fit it."""
+    dtype = pd.api.types.pandas_dtype(dtype)
+    numbers = pd.to_numeric(values, errors='coerce').astype('float64')
+    if pd.api.types.is_integer_dtype(dtype):
+        info = np.iinfo(dtype.numpy_dtype)
+        numbers = numbers.where((numbers % 1 == 0) & numbers.between(info.min, info.max))
+    return numbers.astype(dtype)
+
+
+def csv_read_options(path, columns, dtypes):
+    """Return the usecols and dtype arguments for reading the wanted columns that exist in the CSV.
+
+    columns=None reads every column. Columns without a dtype are read as
+    'string', which the pyarrow engine honours where it ignores object, so
+    dates and IDs come out as text from either engine. Numeric columns are
+    read as text too and converted by apply_numeric_dtypes, so a stray
+    "2019-2021" in a Year column becomes NA instead of failing the whole load.
+    """
+    header = pd.read_csv(path, nrows=0).columns
+    usecols = list(header) if columns is None else [col for col in columns if col in header]
+    dtype = {col: dtypes[col] if col in dtypes and not is_numeric(dtypes[col]) else 'string' for col in usecols}
+    return usecols, dtype
+
+
+def apply_numeric_dtypes(data, dtypes):
+    for col in data.columns:
+        if col in dtypes and is_numeric(dtypes[col]):
+            data[col] = to_numeric(data[col], dtypes[col])
+    return data
+
+
+def read_csv_typed(path, columns, dtypes):
+    """Read only the wanted columns that exist in the CSV, with explicit dtypes.
+
+    Uses the multithreaded pyarrow CSV engine when pyarrow is installed.
+    """
+    usecols, dtype = csv_read_options(path, columns, dtypes)
+    engine = "pyarrow" if HAVE_PYARROW else "c"
+    data = pd.read_csv(path, usecols=usecols, dtype=dtype, engine=engine)[usecols]
+    return apply_numeric_dtypes(data, dtypes)
+
+
+def iter_csv_chunks(path, columns, dtypes, chunksize):
+    """Like read_csv_typed, but yield the CSV in DataFrames of at most chunksize rows."""
+    usecols, dtype = csv_read_options(path, columns, dtypes)
+    # The pyarrow engine can't read in chunks
+    for chunk in pd.read_csv(path, usecols=usecols, dtype=dtype, chunksize=chunksize):
+        yield apply_numeric_dtypes(chunk[usecols], dtypes)
+
+
+def load_csv(path, columns, dtypes):
+    """Load a CSV like read_csv_typed, reusing the snapshot if the CSV hasn't changed.
+
+    The snapshot is a Parquet file (or a pickle without pyarrow) stored in a
+    SNAPSHOT_DIR folder next to the CSV. It is only used while the CSV's size
+    and mtime and the requested columns and dtypes match those recorded with it.
+    """
+    data_path, meta_path = snapshot_paths(path)
+    meta = {
+        "version": SNAPSHOT_VERSION,
+        "fingerprint": list(file_fingerprint(path)),
+        "columns": None if columns is None else list(columns),
+        "dtypes": dtypes,
+    }
+    try:
+        with open(meta_path, encoding="utf-8") as f:
+            if json.load(f) == meta:
+                return pd.read_parquet(data_path) if HAVE_PYARROW else pd.read_pickle(data_path)
+    except Exception:
+        pass  # Missing or unreadable snapshot, fall back to the CSV
+
+    data = read_csv_typed(path, columns, dtypes)
+    try:
+        os.makedirs(os.path.dirname(data_path), exist_ok=True)
+        if HAVE_PYARROW:
+            data.to_parquet(data_path, index=False)
+        else:
+            data.to_pickle(data_path)
+        with open(meta_path, "w", encoding="utf-8") as f:
+            json.dump(meta, f)
+    except Exception as e:
+        print(f"Warning: Could not write snapshot of {path}: {e}")
+    return data
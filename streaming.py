@@ -0,0 +1,126 @@
+"""Chunked comparison for exports too large to load into memory at once."""
+import pandas as pd
+
+from comparison import (COLUMN_DTYPES, ComparisonCancelled, check_columns, entries_to_verify, find_candidates,
+                        verify_candidates, werstreamtes_columns)
+from export import ResultExporter
+from fuzzy_matching import FuzzyTitleMatcher
+from metrics import NULL_METRICS
+from snapshot import file_fingerprint, iter_csv_chunks
+from title_index import TitleIndex
+
+DEFAULT_CHUNKSIZE = 50000
+
+
+def csv_columns(path):
+    """Return the column names in a CSV file's header."""
+    return pd.read_csv(path, nrows=0).columns
+
+
+def load_title_index_chunked(werstreamtes_path, use_year=False, fuzzy_threshold=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Build the title index from the Werstreamt.es export, reading chunksize rows at a time.
+
+    Returns (title_index, fuzzy_matcher). The fuzzy matcher, built only if
+    fuzzy_threshold is given, needs all distinct normalized titles in memory.
+    """
+    chunks = iter_csv_chunks(werstreamtes_path, werstreamtes_columns(use_year), COLUMN_DTYPES, chunksize)
+    if fuzzy_threshold is None:
+        return TitleIndex.from_chunks(chunks, use_year), None
+
+    titles = []
+
+    def collect_titles(chunks):
+        for chunk in chunks:
+            titles.append(chunk.drop_duplicates())
+            yield chunk
+
+    title_index = TitleIndex.from_chunks(collect_titles(chunks), use_year)
+    fuzzy_matcher = FuzzyTitleMatcher(pd.concat(titles, ignore_index=True), threshold=fuzzy_threshold,
+                                      use_year=use_year)
+    return title_index, fuzzy_matcher
+
+
+def has_verifiable_candidates(imdb_path, title_index, fuzzy_matcher=None, chunksize=DEFAULT_CHUNKSIZE):
+    """Return whether any unmatched row of the IMDB export has an IMDB ID to verify.
+
+    Only the title, year and URL columns are read, and the scan stops at the
+    first chunk with such a row, which for a typical export is the first one.
+    """
+    columns = ['Title', 'Original Title', 'Year', 'URL']
+    for chunk in iter_csv_chunks(imdb_path, columns, COLUMN_DTYPES, chunksize):
+        if len(entries_to_verify(find_candidates(chunk, title_index, fuzzy_matcher))) > 0:
+            return True
+    return False
+
+
+def output_columns(imdb_columns, verify):
+    """Return the columns of the streamed output, which must be the same for every chunk."""
+    columns = list(imdb_columns)
+    if 'URL' in columns:
+        columns.append('IMDB ID')
+        if verify:
+            columns.append('Verification')
+    return columns
+
+
+def compare_streaming(imdb_path, werstreamtes_path, output_path, title_index, engine=None, fuzzy_matcher=None,
+                      chunksize=DEFAULT_CHUNKSIZE, progress=None, cancel_event=None, metrics=NULL_METRICS,
+                      settings=None):
+    """Match, verify and write the IMDB export chunk by chunk. Returns (rows, missing, unknown) counts.
+
+    Each chunk of chunksize rows is matched against title_index, verified
+    with engine unless it is None, and its missing rows are appended to
+    output_path (CSV, JSON Lines or Parquet, see export.ResultExporter)
+    with a checkpoint before the next chunk is read, so memory use doesn't
+    grow with the size of the export. If a previous run with the same
+    inputs, chunksize and settings was interrupted, the chunks it finished
+    are skipped. progress, if given, is called as progress(rows_done,
+    missing_so_far) after each chunk. If cancel_event is set,
+    ComparisonCancelled is raised and the output can be resumed later.
+
+    Like in a full run, unmatched rows without an IMDB ID are dropped if any
+    unmatched row can be verified, and all are written otherwise. That is
+    decided up front by has_verifiable_candidates, since any chunk may hold
+    the first row that can be verified.
+    """
+    imdb_columns = csv_columns(imdb_path)
+    check_columns(imdb_columns, csv_columns(werstreamtes_path))
+    verify = False
+    if engine is not None and 'URL' in imdb_columns:
+        with metrics.timer('match'):
+            verify = has_verifiable_candidates(imdb_path, title_index, fuzzy_matcher, chunksize)
+    columns = output_columns(imdb_columns, verify)
+    source = {
+        'imdb': list(file_fingerprint(imdb_path)),
+        'werstreamtes': list(file_fingerprint(werstreamtes_path)),
+        'chunksize': chunksize,
+        'settings': settings,
+    }
+    exporter = ResultExporter(output_path, columns, COLUMN_DTYPES, source)
+
+    rows = 0
+    try:
+        for chunk_number, chunk in enumerate(iter_csv_chunks(imdb_path, None, COLUMN_DTYPES, chunksize)):
+            if cancel_event is not None and cancel_event.is_set():
+                raise ComparisonCancelled()
+            rows += len(chunk)
+            if chunk_number in exporter.done:
+                continue  # Written by an interrupted earlier run
+
+            with metrics.timer('match'):
+                missing_entries = find_candidates(chunk, title_index, fuzzy_matcher)
+            if verify:
+                with metrics.timer('verify'):
+                    missing_entries = verify_candidates(entries_to_verify(missing_entries), engine,
+                                                        cancel_event=cancel_event)
+            with metrics.timer('export'):
+                exporter.add(chunk_number, missing_entries)
+                exporter.checkpoint()
+
+            if progress is not None:
+                progress(rows, exporter.rows)
+    finally:
+        exporter.close()
+    with metrics.timer('export'):
+        exporter.finish()
+    return rows, exporter.rows, exporter.unknown
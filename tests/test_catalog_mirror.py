@@ -0,0 +1,64 @@
+import pytest
+
+from catalog_mirror import CatalogMirror
+from verifier import FOUND, MISSING, VerificationEngine, VerificationResult
+
+
+class RecordingEngine(VerificationEngine):
+    """Engine that answers every web lookup with MISSING and records the IDs it looked up."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.looked_up = []
+
+    def _verify(self, imdb_id):
+        self.looked_up.append(imdb_id)
+        return VerificationResult(MISSING)
+
+
+@pytest.fixture
+def mirror(tmp_path):
+    mirror = CatalogMirror(str(tmp_path / 'mirror.sqlite'))
+    yield mirror
+    mirror.close()
+
+
+def test_lookup_only_knows_found_entries(mirror):
+    mirror.add('tt0133093', VerificationResult(FOUND, 'Matrix', 'https://www.werstreamt.es/film/details/1/'))
+    mirror.add('tt0000002', VerificationResult(MISSING))
+    # A later sighting doesn't overwrite the title and URL already known
+    mirror.add_many([('tt0133093', 'Matrix, The', None)], 'export')
+    assert mirror.lookup(['tt0133093', 'tt0000002', 'tt0133093', 'tt0000003']) == {
+        'tt0133093': VerificationResult(FOUND, 'Matrix', 'https://www.werstreamt.es/film/details/1/'),
+    }
+    assert len(mirror) == 1
+
+
+def test_harvest_export_reads_imdb_columns_once(mirror, tmp_path):
+    path = tmp_path / 'Werstreamtes.csv'
+    path.write_text('Title,OriginalTitle,IMDb\n'
+                    'Matrix,The Matrix,https://www.imdb.com/title/tt0133093/\n'
+                    'Heat,Heat,tt0113277\n'
+                    'Unknown,Unknown,\n', encoding='utf-8')
+    assert mirror.harvest_export(str(path)) == 2
+    assert mirror.lookup(['tt0133093', 'tt0113277']) == {
+        'tt0133093': VerificationResult(FOUND, 'Matrix', None),
+        'tt0113277': VerificationResult(FOUND, 'Heat', None),
+    }
+    # Unchanged exports are skipped
+    assert mirror.harvest_export(str(path)) == 0
+
+
+def test_export_without_imdb_column_adds_nothing(mirror, tmp_path):
+    path = tmp_path / 'Werstreamtes.csv'
+    path.write_text('Title,OriginalTitle\nMatrix,The Matrix\n', encoding='utf-8')
+    assert mirror.harvest_export(str(path)) == 0
+    assert len(mirror) == 0
+
+
+def test_engine_only_searches_for_ids_the_mirror_doesnt_know(mirror):
+    mirror.add('tt0133093', VerificationResult(FOUND, 'Matrix'))
+    engine = RecordingEngine(mirror=mirror)
+    verdicts = {imdb_id: result.verdict for imdb_id, result in engine.verify_all(['tt0133093', 'tt0000002'])}
+    assert verdicts == {'tt0133093': FOUND, 'tt0000002': MISSING}
+    assert engine.looked_up == ['tt0000002']
@@ -0,0 +1,61 @@
+import pandas as pd
+
+from comparison import load_files, verify_ids
+from verifier import FOUND, MISSING, VerificationResult
+
+IMDB_CSV = """Const,Title,Original Title,URL,Year,IMDb Rating,Your Rating
+tt0000001,Listed,Listed,https://www.imdb.com/title/tt0000001/,1999,7.2,8
+tt0000002,Gone,Gone,https://www.imdb.com/title/tt0000002/,n/a,x,
+tt0000003,Found Online,Found Online,https://www.imdb.com/title/tt0000003/,2001,6.0,5
+tt0000004,No Link,No Link,,2002,5.5,4
+tt0000005,Also Gone,Also Gone,https://www.imdb.com/title/tt0000005/,2003,8.1,
+"""
+
+WERSTREAMTES_CSV = """Title,OriginalTitle,Year
+Listed,Listed,2019-2021
+"""
+
+
+class FakeEngine:
+    """Answer every lookup with MISSING, except tt0000003 which is FOUND, and record the IDs looked up."""
+
+    cache = None
+
+    def __init__(self):
+        self.calls = []
+
+    def verify_all(self, imdb_ids):
+        for imdb_id in imdb_ids:
+            self.calls.append(imdb_id)
+            yield imdb_id, VerificationResult(FOUND if imdb_id == 'tt0000003' else MISSING)
+
+
+def write_files(tmp_path):
+    imdb_path = tmp_path / 'IMDB.csv'
+    werstreamtes_path = tmp_path / 'Werstreamtes.csv'
+    imdb_path.write_text(IMDB_CSV, encoding='utf-8')
+    werstreamtes_path.write_text(WERSTREAMTES_CSV, encoding='utf-8')
+    return str(imdb_path), str(werstreamtes_path)
+
+
+def test_load_files_keeps_imdb_columns_and_coerces_bad_numbers(tmp_path):
+    imdb_path, werstreamtes_path = write_files(tmp_path)
+    imdb_data, werstreamtes_data = load_files(imdb_path, werstreamtes_path)
+    assert list(imdb_data.columns) == ['Const', 'Title', 'Original Title', 'URL', 'Year', 'IMDb Rating',
+                                       'Your Rating']
+    assert imdb_data['Year'].isna().tolist() == [False, True, False, False, False]
+    assert imdb_data['IMDb Rating'].isna().tolist() == [False, True, False, False, False]
+    assert imdb_data['Your Rating'].tolist() == ['8', pd.NA, '5', '4', pd.NA]
+    assert list(werstreamtes_data.columns) == ['Title', 'OriginalTitle']
+
+    _, werstreamtes_data = load_files(imdb_path, werstreamtes_path, use_year=True)
+    assert werstreamtes_data['Year'].isna().all()
+
+
+def test_repeated_ids_are_looked_up_once():
+    engine = FakeEngine()
+    progress = []
+    verdicts = verify_ids(['tt0000002', 'tt0000003', 'tt0000002'], engine, lambda done, total: progress.append(total))
+    assert engine.calls == ['tt0000002', 'tt0000003']
+    assert verdicts == {'tt0000002': MISSING, 'tt0000003': FOUND}
+    assert progress == [2, 2]
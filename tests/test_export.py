@@ -0,0 +1,129 @@
+import json
+
+import pandas as pd
+import pytest
+
+from export import CHECKPOINT_SUFFIX, SPOOL_SUFFIX, ResultExporter, write_results
+from snapshot import HAVE_PYARROW
+
+COLUMNS = ['Title', 'IMDB ID', 'Verification']
+
+
+def rows(*titles, verification='missing'):
+    return pd.DataFrame({'Title': list(titles), 'IMDB ID': [f"tt{i:07d}" for i in range(len(titles))],
+                         'Verification': verification})
+
+
+def crash(exporter):
+    """Drop an exporter without close(), like a killed run."""
+    exporter._data.close()
+    exporter._journal.close()
+
+
+def test_finish_writes_all_rows_and_removes_journal(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    exporter = ResultExporter(path, COLUMNS, checkpoint_every=1)
+    exporter.add('tt1', rows('A'))
+    exporter.add('tt2')
+    exporter.add('tt3', rows('B', 'C', verification='unknown'))
+    exporter.finish()
+
+    data = pd.read_csv(path)
+    assert list(data.columns) == COLUMNS
+    assert list(data['Title']) == ['A', 'B', 'C']
+    assert (exporter.rows, exporter.unknown) == (3, 2)
+    assert not (tmp_path / ('out.csv' + CHECKPOINT_SUFFIX)).exists()
+
+
+def test_resume_skips_checkpointed_keys_and_truncates_the_rest(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    source = {'imdb': [1, 2]}
+    exporter = ResultExporter(path, COLUMNS, source=source, checkpoint_every=100)
+    exporter.add('tt1', rows('A'))
+    exporter.add('tt2', rows('B'))
+    exporter.checkpoint()
+    exporter.add('tt3', rows('C'))  # Buffered, never checkpointed
+    crash(exporter)
+
+    # Half-written rows and a torn journal line, as left by a run killed mid-write
+    with open(path, 'a', encoding='utf-8') as f:
+        f.write('C,tt0000003,mis')
+    with open(path + CHECKPOINT_SUFFIX, 'a', encoding='utf-8') as f:
+        f.write('{"offset": 99')
+
+    exporter = ResultExporter(path, COLUMNS, source=source)
+    assert exporter.resumed
+    assert exporter.done == {'tt1', 'tt2'}
+    assert exporter.rows == 2
+    exporter.add('tt3', rows('C'))
+    exporter.finish()
+
+    assert list(pd.read_csv(path)['Title']) == ['A', 'B', 'C']
+
+
+def test_changed_source_starts_over(tmp_path):
+    path = str(tmp_path / 'out.csv')
+    exporter = ResultExporter(path, COLUMNS, source={'imdb': [1, 2]})
+    exporter.add('tt1', rows('A'))
+    exporter.checkpoint()
+    crash(exporter)
+
+    exporter = ResultExporter(path, COLUMNS, source={'imdb': [1, 3]})
+    assert not exporter.resumed
+    exporter.finish()
+    assert len(pd.read_csv(path)) == 0
+
+
+def test_jsonl_keeps_short_float32_values(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    data = pd.DataFrame({'Title': ['A'], 'IMDb Rating': pd.Series([7.2], dtype='float32')})
+    write_results(data, path)
+
+    with open(path, encoding='utf-8') as f:
+        assert json.loads(f.readline()) == {'Title': 'A', 'IMDb Rating': 7.2}
+
+
+@pytest.mark.skipif(not HAVE_PYARROW, reason="Parquet output needs pyarrow")
+def test_parquet_resume_converts_the_spool(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    exporter = ResultExporter(path, COLUMNS, checkpoint_every=1)
+    exporter.add('tt1', rows('A'))
+    crash(exporter)
+    assert (tmp_path / ('out.parquet' + SPOOL_SUFFIX)).exists()
+
+    exporter = ResultExporter(path, COLUMNS)
+    assert exporter.done == {'tt1'}
+    exporter.add('tt2', rows('B'))
+    exporter.finish()
+
+    assert list(pd.read_parquet(path)['Title']) == ['A', 'B']
+    assert not (tmp_path / ('out.parquet' + SPOOL_SUFFIX)).exists()
+
+
+def dated_rows():
+    return pd.DataFrame({
+        'Title': pd.array(['A', 'B'], dtype='string'),
+        'Date Rated': pd.array(['2020-01-01', '2021-02-03'], dtype='string'),
+        'Your Rating': pd.array(['8', None], dtype='string'),
+        'Released': pd.to_datetime(['1999-03-31', None]),
+        'Year': pd.array([1999, None], dtype='Int16'),
+    })
+
+
+def test_jsonl_writes_dates_as_iso_text(tmp_path):
+    path = str(tmp_path / 'out.jsonl')
+    write_results(dated_rows(), path)
+
+    with open(path, encoding='utf-8') as f:
+        first = json.loads(f.readline())
+    assert first['Date Rated'] == '2020-01-01'
+    assert first['Released'].startswith('1999-03-31T00:00:00')
+    assert first['Your Rating'] == '8'
+
+
+@pytest.mark.skipif(not HAVE_PYARROW, reason="Parquet output needs pyarrow")
+def test_parquet_keeps_the_column_types(tmp_path):
+    path = str(tmp_path / 'out.parquet')
+    data = dated_rows()
+    write_results(data, path)
+    pd.testing.assert_frame_equal(pd.read_parquet(path), data)
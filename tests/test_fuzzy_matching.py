@@ -0,0 +1,27 @@
+import pandas as pd
+
+from fuzzy_matching import FuzzyTitleMatcher, title_numbers
+
+
+def test_title_numbers_read_digits_and_roman_numerals():
+    assert title_numbers('rocky iii') == title_numbers('rocky 3') == (3,)
+    assert title_numbers('star wars episode iv') == (4,)
+    assert title_numbers('mix it up') == ()
+
+
+def test_fuzzy_matching_keeps_sequels_apart():
+    matcher = FuzzyTitleMatcher(pd.DataFrame({'Title': ['Rocky II', 'Star Wars: Episode V', 'Amélie'],
+                                              'OriginalTitle': ['Rocky II', 'Star Wars: Episode V', 'Amélie']}))
+    imdb_data = pd.DataFrame({'Title': ['Rocky III', 'Star Wars: Episode IV', 'Star Wars - Episode V', 'Amelie!!'],
+                              'Original Title': [None] * 4})
+    assert list(matcher.match(imdb_data)) == [False, False, True, True]
+
+
+def test_fuzzy_matching_keeps_remakes_apart_with_years():
+    werstreamtes_data = pd.DataFrame({'Title': ['Dune', 'Solaris'], 'OriginalTitle': ['Dune', 'Solaris'],
+                                      'Year': pd.array([2021, None], dtype='Int16')})
+    imdb_data = pd.DataFrame({'Title': ['Dune', 'Dune!', 'Solaris', 'Dune'], 'Original Title': [None] * 4,
+                              'Year': pd.array([1984, 2021, 1972, None], dtype='Int16')})
+    assert list(FuzzyTitleMatcher(werstreamtes_data).match(imdb_data)) == [True, True, True, True]
+    matcher = FuzzyTitleMatcher(werstreamtes_data, use_year=True)
+    assert list(matcher.match(imdb_data)) == [False, True, True, True]
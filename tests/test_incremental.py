@@ -0,0 +1,116 @@
+import pandas as pd
+import pytest
+
+from incremental import compare_incremental
+from title_index import TitleIndex
+from verifier import FOUND, MISSING, UNKNOWN, VerificationResult
+
+
+class FakeCache:
+    def __init__(self, missing_ttl=3600, found_ttl=3600):
+        self.missing_ttl = missing_ttl
+        self.found_ttl = found_ttl
+
+
+class FakeEngine:
+    """Answer lookups from a dict of verdicts and record which IDs were looked up."""
+
+    def __init__(self, verdicts, cache=None):
+        self.verdicts = verdicts
+        self.cache = cache
+        self.calls = []
+
+    def verify_all(self, imdb_ids):
+        for imdb_id in imdb_ids:
+            self.calls.append(imdb_id)
+            yield imdb_id, VerificationResult(self.verdicts.get(imdb_id, MISSING))
+
+
+def imdb_rows(*titles):
+    return pd.DataFrame({
+        'Title': list(titles),
+        'Original Title': list(titles),
+        'URL': [f"https://www.imdb.com/title/tt{i:07d}/" for i in range(1, len(titles) + 1)],
+    })
+
+
+@pytest.fixture
+def files(tmp_path):
+    werstreamtes_path = tmp_path / 'Werstreamtes.csv'
+    werstreamtes_path.write_text('Title,OriginalTitle\nListed,Listed\n', encoding='utf-8')
+    return str(tmp_path / 'IMDB.csv'), str(werstreamtes_path), str(tmp_path / 'state.pkl')
+
+
+def run(files, imdb_data, engine):
+    imdb_path, werstreamtes_path, state_path = files
+    title_index = TitleIndex(pd.read_csv(werstreamtes_path))
+    return compare_incremental(imdb_path, imdb_data, werstreamtes_path, title_index, engine, state_path=state_path)
+
+
+def test_unchanged_rows_reuse_their_outcome(files):
+    imdb_data = imdb_rows('Listed', 'Gone', 'Found Online')
+    engine = FakeEngine({'tt0000003': FOUND})
+    first = run(files, imdb_data, engine)
+    assert engine.calls == ['tt0000002', 'tt0000003']
+    assert list(first['Title']) == ['Gone']
+
+    engine = FakeEngine({})
+    second = run(files, imdb_data, engine)
+    assert engine.calls == []
+    pd.testing.assert_frame_equal(second, first)
+
+
+def test_changed_and_new_rows_are_verified_again(files):
+    run(files, imdb_rows('Listed', 'Gone'), FakeEngine({}))
+
+    imdb_data = imdb_rows('Listed', 'Gone Again', 'New')
+    engine = FakeEngine({'tt0000003': FOUND})
+    result = run(files, imdb_data, engine)
+    assert sorted(engine.calls) == ['tt0000002', 'tt0000003']
+    assert list(result['Title']) == ['Gone Again']
+
+
+def test_failed_lookups_are_retried(files):
+    imdb_data = imdb_rows('Gone')
+    run(files, imdb_data, FakeEngine({'tt0000001': UNKNOWN}))
+
+    engine = FakeEngine({})
+    result = run(files, imdb_data, engine)
+    assert engine.calls == ['tt0000001']
+    assert list(result['Verification']) == [MISSING]
+
+
+def test_expired_missing_verdicts_are_verified_again(files):
+    imdb_data = imdb_rows('Gone', 'Found Online')
+    run(files, imdb_data, FakeEngine({'tt0000002': FOUND}))
+
+    # Missing verdicts expire at once, found ones are still fresh
+    engine = FakeEngine({'tt0000001': FOUND}, cache=FakeCache(missing_ttl=0))
+    result = run(files, imdb_data, engine)
+    assert engine.calls == ['tt0000001']
+    assert len(result) == 0
+
+
+def test_werstreamtes_changes_rematch_affected_rows(files):
+    imdb_path, werstreamtes_path, _ = files
+    imdb_data = imdb_rows('Listed', 'Gone')
+    run(files, imdb_data, FakeEngine({}))
+
+    with open(werstreamtes_path, 'a', encoding='utf-8') as f:
+        f.write('Gone,Gone\n')
+    engine = FakeEngine({})
+    result = run(files, imdb_data, engine)
+    assert engine.calls == []
+    assert len(result) == 0
+
+
+def test_rows_with_a_repeated_id_are_all_reused(files):
+    imdb_data = imdb_rows('Gone', 'Gone (Director\'s Cut)', 'Listed')
+    imdb_data['URL'] = "https://www.imdb.com/title/tt0000001/"
+    first = run(files, imdb_data, FakeEngine({}))
+    assert list(first['Title']) == ['Gone', 'Gone (Director\'s Cut)']
+
+    engine = FakeEngine({})
+    second = run(files, imdb_data, engine)
+    assert engine.calls == []
+    pd.testing.assert_frame_equal(second, first)
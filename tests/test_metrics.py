@@ -0,0 +1,28 @@
+from metrics import Metrics
+
+
+def test_prometheus_export_has_counters_ratio_and_a_cumulative_histogram():
+    metrics = Metrics()
+    metrics.increment('cache_hits', 3)
+    metrics.increment('cache_misses')
+    for seconds in (0.01, 0.2, 0.3, 20.0):
+        metrics.observe_latency(seconds)
+    lines = metrics.to_prometheus().splitlines()
+
+    assert '# TYPE werstreamtes_cache_hits_total counter' in lines
+    assert 'werstreamtes_cache_hits_total 3' in lines
+    assert 'werstreamtes_cache_hit_ratio 0.75' in lines
+    assert 'werstreamtes_request_seconds_bucket{le="0.05"} 1' in lines
+    assert 'werstreamtes_request_seconds_bucket{le="0.25"} 2' in lines
+    assert 'werstreamtes_request_seconds_bucket{le="10.0"} 3' in lines
+    assert 'werstreamtes_request_seconds_bucket{le="+Inf"} 4' in lines
+    assert 'werstreamtes_request_seconds_count 4' in lines
+
+
+def test_stage_timers_add_up():
+    metrics = Metrics()
+    for _ in range(2):
+        with metrics.timer('match'):
+            pass
+    assert list(metrics.snapshot()['stages_seconds']) == ['match']
+    assert 'werstreamtes_stage_seconds{stage="match"}' in metrics.to_prometheus()
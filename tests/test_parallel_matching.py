@@ -0,0 +1,32 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from parallel_matching import ParallelTitleMatcher
+from title_index import TitleIndex
+
+WERSTREAMTES = pd.DataFrame({
+    'Title': ['Matrix', 'Die Verurteilten', 'Dune', 'Haine', 'Solaris'],
+    'OriginalTitle': ['The Matrix', 'The Shawshank Redemption', 'Dune', 'Haine', None],
+    'Year': pd.array([1999, 1994, 2021, 1995, None], dtype='Int16'),
+})
+
+IMDB = pd.DataFrame({
+    'Title': ['The Matrix', 'Die Verurteilten', 'Dune', 'Dune', 'La Haine', 'Solaris', 'Stalker', None],
+    'Original Title': ['The Matrix', 'Die Verurteilten', 'Dune', 'Dune', 'La Haine', 'Solaris', 'Stalker', 'Dune'],
+    'Year': pd.array([1999, 1994, 1984, 2021, 1995, 1972, 1979, 2021], dtype='Int16'),
+})
+
+
+@pytest.mark.parametrize('use_year', [False, True])
+def test_workers_match_like_the_title_index(use_year):
+    title_index = TitleIndex(WERSTREAMTES, use_year=use_year)
+    with ParallelTitleMatcher(title_index, workers=2, chunk_rows=3) as matcher:
+        matched = matcher.match(IMDB)
+    np.testing.assert_array_equal(matched, title_index.match(IMDB))
+
+
+def test_empty_index_matches_nothing():
+    title_index = TitleIndex(WERSTREAMTES.iloc[:0])
+    with ParallelTitleMatcher(title_index, workers=2, chunk_rows=3) as matcher:
+        assert not matcher.match(IMDB).any()
@@ -0,0 +1,38 @@
+import numpy as np
+import pandas as pd
+
+from results_filter import ResultsFilter
+
+RESULTS = pd.DataFrame({
+    'Title': ['Die fabelhafte Welt der Amélie', 'The Matrix', 'Matrix Reloaded', 'Heat'],
+    'Original Title': ["Le fabuleux destin d'Amélie Poulain", 'The Matrix', 'The Matrix Reloaded', None],
+    'Year': pd.array([2001, 1999, 2003, None], dtype='Int16'),
+    'IMDb Rating': [8.3, 8.7, 7.2, 8.3],
+    'Genres': ['Comedy, Romance', 'Action, Sci-Fi', 'Action,Sci-Fi', None],
+})
+
+
+def test_search_ignores_case_and_accents():
+    results_filter = ResultsFilter(RESULTS)
+    assert list(results_filter.apply('AMELIE')) == [0]
+    assert list(results_filter.apply('matrix')) == [1, 2]
+    assert list(results_filter.apply('ea')) == [3]
+
+
+def test_ranges_and_genre_combine():
+    results_filter = ResultsFilter(RESULTS)
+    assert list(results_filter.apply(year=(2000, None))) == [0, 2]
+    assert list(results_filter.apply(rating=(8, 8.5))) == [0, 3]
+    assert list(results_filter.apply('matrix', genre='Sci-Fi', rating=(8, None))) == [1]
+
+
+def test_genres_skip_rows_without_genres():
+    assert ResultsFilter(RESULTS).genres == ['Action', 'Comedy', 'Romance', 'Sci-Fi']
+
+
+def test_sort_puts_empty_values_last():
+    results_filter = ResultsFilter(RESULTS)
+    assert list(results_filter.apply(sort_column='Year')) == [1, 0, 2, 3]
+    assert list(results_filter.apply(sort_column='Year', descending=True)) == [2, 0, 1, 3]
+    positions = results_filter.apply(sort_column='IMDb Rating', descending=True)
+    assert np.array_equal(positions, [1, 0, 3, 2])
@@ -0,0 +1,29 @@
+import pandas as pd
+
+from comparison import COLUMN_DTYPES
+from snapshot import iter_csv_chunks, load_csv, read_csv_typed
+
+IMDB_CSV = """Const,Date Rated,Your Rating,Num Votes,Year,Genres
+tt0000001,2020-01-01,8,,1999,Drama
+tt0000002,2021-02-03,,12,n/a,
+"""
+
+
+def test_untyped_columns_are_text_with_either_engine(tmp_path):
+    path = tmp_path / 'IMDB.csv'
+    path.write_text(IMDB_CSV, encoding='utf-8')
+    data = read_csv_typed(str(path), None, COLUMN_DTYPES)
+    assert data['Date Rated'].tolist() == ['2020-01-01', '2021-02-03']
+    assert data['Your Rating'].tolist() == ['8', pd.NA]
+    assert data['Year'].tolist() == [1999, pd.NA]
+
+    chunks = list(iter_csv_chunks(str(path), None, COLUMN_DTYPES, chunksize=10))
+    pd.testing.assert_frame_equal(chunks[0], data)
+
+
+def test_snapshot_round_trips_the_csv(tmp_path):
+    path = tmp_path / 'IMDB.csv'
+    path.write_text(IMDB_CSV, encoding='utf-8')
+    loaded = load_csv(str(path), None, COLUMN_DTYPES)
+    pd.testing.assert_frame_equal(load_csv(str(path), None, COLUMN_DTYPES), loaded)
+    pd.testing.assert_frame_equal(loaded, read_csv_typed(str(path), None, COLUMN_DTYPES))
@@ -0,0 +1,72 @@
+import pandas as pd
+import pytest
+
+from comparison import find_candidates, load_files, verify_candidates
+from streaming import compare_streaming, load_title_index_chunked
+from title_index import TitleIndex
+from verifier import FOUND, MISSING, VerificationResult
+from Werstreamtes import parse_args, streaming_matcher
+
+IMDB_CSV = """Const,Title,Original Title,URL,Year,IMDb Rating,Your Rating
+tt0000001,Listed,Listed,https://www.imdb.com/title/tt0000001/,1999,7.2,8
+tt0000002,Gone,Gone,https://www.imdb.com/title/tt0000002/,n/a,x,
+tt0000003,Found Online,Found Online,https://www.imdb.com/title/tt0000003/,2001,6.0,5
+tt0000004,No Link,No Link,,2002,5.5,4
+tt0000005,Also Gone,Also Gone,https://www.imdb.com/title/tt0000005/,2003,8.1,
+"""
+
+# Only the listed title has an IMDB ID, so no unmatched row can be verified
+UNVERIFIABLE_CSV = """Const,Title,Original Title,URL,Year
+tt0000001,Listed,Listed,https://www.imdb.com/title/tt0000001/,1999
+tt0000004,No Link,No Link,,2002
+tt0000006,No Link Either,No Link Either,,2004
+"""
+
+WERSTREAMTES_CSV = """Title,OriginalTitle,Year
+Listed,Listed,2019-2021
+"""
+
+
+class FakeEngine:
+    cache = None
+
+    def verify_all(self, imdb_ids):
+        for imdb_id in imdb_ids:
+            yield imdb_id, VerificationResult(FOUND if imdb_id == 'tt0000003' else MISSING)
+
+
+def write_files(tmp_path, imdb_csv):
+    imdb_path = tmp_path / 'IMDB.csv'
+    werstreamtes_path = tmp_path / 'Werstreamtes.csv'
+    imdb_path.write_text(imdb_csv, encoding='utf-8')
+    werstreamtes_path.write_text(WERSTREAMTES_CSV, encoding='utf-8')
+    return str(imdb_path), str(werstreamtes_path)
+
+
+@pytest.mark.parametrize('imdb_csv, expected', [
+    (IMDB_CSV, ['Gone', 'Also Gone']),
+    (UNVERIFIABLE_CSV, ['No Link', 'No Link Either']),
+])
+def test_streaming_matches_a_full_run(tmp_path, imdb_csv, expected):
+    imdb_path, werstreamtes_path = write_files(tmp_path, imdb_csv)
+    imdb_data, werstreamtes_data = load_files(imdb_path, werstreamtes_path)
+    candidates = find_candidates(imdb_data, TitleIndex(werstreamtes_data))
+    full = verify_candidates(candidates, FakeEngine())
+    assert list(full['Title']) == expected
+
+    for chunksize in (1, 2, 3, 10):
+        output_path = str(tmp_path / f'streamed_{chunksize}.csv')
+        title_index, _ = load_title_index_chunked(werstreamtes_path, chunksize=chunksize)
+        rows, missing, unknown = compare_streaming(imdb_path, werstreamtes_path, output_path, title_index,
+                                                   FakeEngine(), chunksize=chunksize)
+        assert (rows, missing, unknown) == (len(imdb_data), len(expected), 0)
+        streamed = pd.read_csv(output_path)
+        assert list(streamed['Title']) == list(full['Title'])
+        assert list(streamed.columns) == list(full.columns)
+
+
+def test_streamed_chunks_are_split_over_the_processes():
+    args = parse_args(['IMDB.csv', 'Werstreamtes.csv', 'out.csv', '--chunksize', '1001', '--processes', '4'])
+    with streaming_matcher(args, TitleIndex(pd.DataFrame({'Title': [], 'OriginalTitle': []}))) as matcher:
+        assert matcher.workers == 4
+        assert matcher.chunk_rows == 251
@@ -0,0 +1,51 @@
+import pandas as pd
+
+from title_index import TitleIndex, normalize_titles
+
+
+def werstreamtes(*entries):
+    titles, years = zip(*entries)
+    return pd.DataFrame({'Title': titles, 'OriginalTitle': titles, 'Year': pd.array(years, dtype='Int16')})
+
+
+def imdb(*entries):
+    titles, years = zip(*entries)
+    return pd.DataFrame({'Title': titles, 'Original Title': titles, 'Year': pd.array(years, dtype='Int16')})
+
+
+def test_normalize_ignores_case_accents_and_punctuation():
+    titles = pd.Series(["Die Fabelhafte Welt der Amélie!", "die fabelhafte welt der amelie", "  ", None])
+    normalized = normalize_titles(titles)
+    assert normalized[0] == normalized[1] == "die fabelhafte welt der amelie"
+    assert normalized[2:].isna().all()
+
+
+def test_either_title_column_matches():
+    index = TitleIndex(pd.DataFrame({'Title': ['Die Verurteilten'], 'OriginalTitle': ['The Shawshank Redemption']}))
+    imdb_data = pd.DataFrame({'Title': ['Die Verurteilten', 'Other'],
+                              'Original Title': ['Something Else', 'The Shawshank Redemption']})
+    assert list(index.match(imdb_data)) == [True, True]
+
+
+def test_year_keeps_remakes_apart():
+    index = TitleIndex(werstreamtes(('Dune', 2021), ('Solaris', None)), use_year=True)
+    matched = index.match(imdb(('Dune', 1984), ('Dune', 2021), ('Solaris', 1972)))
+    assert list(matched) == [False, True, True]
+
+
+def test_unambiguous_articles_are_ignored_without_years():
+    index = TitleIndex(werstreamtes(('Matrix', 1999), ('Hard', 2012), ('Haine', 1995), ('Land', 2016)))
+    matched = index.match(imdb(('The Matrix', 1999), ('Die Hard', 1988), ('La Haine', 1995), ('La La Land', 2016)))
+    assert list(matched) == [True, False, False, False]
+
+
+def test_any_article_is_ignored_within_the_same_year():
+    index = TitleIndex(werstreamtes(('Matrix', 1999), ('Hard', 2012), ('Haine', 1995)), use_year=True)
+    matched = index.match(imdb(('The Matrix', 1999), ('Die Hard', 1988), ('La Haine', 1995), ('Hard', 2012)))
+    assert list(matched) == [True, False, True, True]
+
+
+def test_from_chunks_builds_the_same_index():
+    data = werstreamtes(('Dune', 2021), ('Solaris', None), ('The Matrix', 1999), ('Dune', 2021))
+    chunks = [data.iloc[:1], data.iloc[1:3], data.iloc[3:]]
+    assert set(TitleIndex.from_chunks(chunks, use_year=True).keys) == set(TitleIndex(data, use_year=True).keys)
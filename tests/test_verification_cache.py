@@ -0,0 +1,64 @@
+import pytest
+
+import verification_cache
+from verification_cache import VerificationCache
+from verifier import FOUND, MISSING, VerificationResult
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 1000000.0
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = FakeClock()
+    monkeypatch.setattr(verification_cache, 'time', clock)
+    return clock
+
+
+@pytest.fixture
+def cache(tmp_path, clock):
+    cache = VerificationCache(str(tmp_path / 'cache.sqlite'), found_ttl=100, missing_ttl=10, max_entries=3)
+    yield cache
+    cache.close()
+
+
+def test_results_round_trip_with_their_match(cache):
+    cache.put('tt1', VerificationResult(FOUND, 'Matrix', 'https://www.werstreamt.es/film/details/1/'))
+    cache.put('tt2', VerificationResult(MISSING))
+    assert cache.get_many(['tt1', 'tt2', 'tt3', 'tt1']) == {
+        'tt1': VerificationResult(FOUND, 'Matrix', 'https://www.werstreamt.es/film/details/1/'),
+        'tt2': VerificationResult(MISSING),
+    }
+
+
+def test_missing_verdicts_expire_before_found_ones(cache, clock):
+    cache.put('tt1', VerificationResult(FOUND))
+    cache.put('tt2', VerificationResult(MISSING))
+    clock.now += 50
+    assert set(cache.get_many(['tt1', 'tt2'])) == {'tt1'}
+    clock.now += 50
+    assert cache.get_many(['tt1', 'tt2']) == {}
+
+
+def test_commit_evicts_the_oldest_entries(cache, clock):
+    for i in range(5):
+        cache.put(f"tt{i}", VerificationResult(FOUND))
+        clock.now += 1
+    cache.commit()
+    assert set(cache.get_many([f"tt{i}" for i in range(5)])) == {'tt2', 'tt3', 'tt4'}
+
+
+def test_verdicts_survive_reopening(tmp_path, clock):
+    path = str(tmp_path / 'cache.sqlite')
+    cache = VerificationCache(path)
+    cache.put('tt1', VerificationResult(MISSING))
+    cache.close()
+
+    cache = VerificationCache(path)
+    assert cache.get_many(['tt1']) == {'tt1': VerificationResult(MISSING)}
+    cache.close()
@@ -0,0 +1,124 @@
+import threading
+import time
+
+from benchmarks.stub_server import StubServer, is_listed
+from metrics import Metrics
+from verifier import (FOUND, MISSING, NO_RESULTS_TEXT, UNKNOWN, TokenBucket, VerificationEngine, VerificationResult,
+                      parse_search_page, verify_entry)
+
+SEARCH_URL = "https://www.werstreamt.es/filme-serien/?q=tt0133093"
+
+NAVIGATION = '<html><head></head><body><a href="/film/details/1/nav-teaser/">Teaser</a>'
+SEARCH_FORM = '<input name="q" value="tt0133093">'
+RESULT = '<a class="result" href="/film/details/99/matrix/"><strong>Matrix &amp; Co</strong></a>'
+
+
+class SlowEngine(VerificationEngine):
+    """Engine whose lookups sleep instead of hitting the network, recording how many overlap."""
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.started = 0
+        self.running = 0
+        self.max_running = 0
+        self._running_lock = threading.Lock()
+
+    def _verify(self, imdb_id):
+        with self._running_lock:
+            self.started += 1
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(0.02)
+        with self._running_lock:
+            self.running -= 1
+        return VerificationResult(MISSING)
+
+
+def test_token_bucket_allows_a_burst_then_the_rate():
+    bucket = TokenBucket(rate=50, capacity=3)
+    start = time.monotonic()
+    for _ in range(3):
+        bucket.acquire()
+    assert time.monotonic() - start < 0.05
+
+    for _ in range(5):
+        bucket.acquire()
+    # Five more tokens at 50 per second take about 0.1s
+    assert time.monotonic() - start >= 0.08
+
+
+def test_engine_bounds_lookups_in_flight():
+    engine = SlowEngine(max_workers=3)
+    imdb_ids = [f"tt{i:07d}" for i in range(20)]
+    results = dict(engine.verify_all(imdb_ids))
+    assert sorted(results) == imdb_ids
+    assert engine.max_running == 3
+
+
+def test_stopping_early_starts_no_further_lookups():
+    engine = SlowEngine(max_workers=2)
+    results = engine.verify_all([f"tt{i:07d}" for i in range(50)])
+    next(results)
+    results.close()
+    time.sleep(0.1)
+    assert engine.running == 0
+    # Only the lookups already submitted when the caller stopped have run
+    assert engine.started <= 4
+
+
+def chunked(page, size):
+    data = page.encode('utf-8')
+    return [data[i:i + size] for i in range(0, len(data), size)]
+
+
+def test_no_results_text_means_missing():
+    page = NAVIGATION + SEARCH_FORM + f"<p>{NO_RESULTS_TEXT}</p></body></html>"
+    assert parse_search_page(chunked(page, 1000), 'tt0133093').verdict == MISSING
+
+
+def test_no_results_text_split_across_chunks():
+    page = NAVIGATION + SEARCH_FORM + f"<p>{NO_RESULTS_TEXT}</p></body></html>"
+    assert parse_search_page(chunked(page, 7), 'tt0133093').verdict == MISSING
+
+
+def test_first_result_after_the_search_term_is_the_match():
+    page = NAVIGATION + SEARCH_FORM + RESULT + '</body></html>'
+    result = parse_search_page(chunked(page, 16), 'tt0133093', SEARCH_URL)
+    assert result.verdict == FOUND
+    assert result.title == 'Matrix & Co'
+    assert result.url == 'https://www.werstreamt.es/film/details/99/matrix/'
+
+
+def test_parsing_stops_once_the_verdict_is_known():
+    page = NAVIGATION + SEARCH_FORM + RESULT
+    chunks = iter(chunked(page, 16) + [b'never read'])
+    assert parse_search_page(chunks, 'tt0133093').verdict == FOUND
+    assert next(chunks) == b'never read'
+
+
+def test_page_without_a_verdict_is_unknown():
+    page = NAVIGATION + SEARCH_FORM + '</body></html>'
+    assert parse_search_page(chunked(page, 1000), 'tt0133093') == (UNKNOWN, None, None)
+
+
+def test_lookups_reuse_pooled_connections():
+    imdb_ids = [f"tt{i:07d}" for i in range(1, 41)]
+    with StubServer(latency=0) as stub:
+        engine = VerificationEngine(max_workers=2, requests_per_second=1000, search_url=stub.search_url)
+        verdicts = {imdb_id: result.verdict for imdb_id, result in engine.verify_all(imdb_ids)}
+        assert stub.requests == len(imdb_ids)
+        assert stub.connections <= 2
+
+    assert verdicts == {imdb_id: FOUND if is_listed(imdb_id, stub.missing_ratio) else MISSING
+                        for imdb_id in imdb_ids}
+
+
+def test_failed_lookups_are_unknown_and_reported_on_stderr(capsys):
+    metrics = Metrics()
+    # Nothing listens on the discard port
+    result = verify_entry('tt0133093', search_url="http://127.0.0.1:9/?q={imdb_id}", metrics=metrics)
+    assert result.verdict == UNKNOWN
+    assert metrics.counters['lookup_errors'] == 1
+    captured = capsys.readouterr()
+    assert captured.out == ''
+    assert 'tt0133093' in captured.err
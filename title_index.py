@@ -0,0 +1,156 @@
+"""Normalized title index used to match IMDB titles against the Werstreamt.es export."""
+import numpy as np
+import pandas as pd
+
+# Unicode combining marks left behind by NFKD decomposition (accents, umlaut dots, ...)
+COMBINING_MARKS_RE = '[\u0300-\u036f\u1ab0-\u1aff\u1dc0-\u1dff\u20d0-\u20ff\ufe20-\ufe2f]'
+
+# Leading articles that are often dropped or moved in localized titles
+ARTICLES = ('the', 'a', 'an', 'der', 'die', 'das', 'ein', 'eine',
+            'le', 'la', 'les', 'l', 'el', 'los', 'las', 'il', 'lo')
+# The articles that aren't also a common word in another language ("Die Hard", "La La Land", "A Bout de Souffle")
+UNAMBIGUOUS_ARTICLES = ('the', 'der', 'das', 'les', 'los', 'las')
+
+
+def leading_article_re(articles):
+    return r'^(?:' + '|'.join(articles) + r')\s+'
+
+
+LEADING_ARTICLE_RE = leading_article_re(ARTICLES)
+UNAMBIGUOUS_ARTICLE_RE = leading_article_re(UNAMBIGUOUS_ARTICLES)
+
+# Marks the keys of titles without their leading article, which only match within the same year
+ARTICLE_KEY_PREFIX = '~'
+
+
+def normalize_titles(titles):
+    """Return a normalized copy of a Series of titles, with NA for empty ones.
+
+    Titles are NFKD-decomposed with accents removed, casefolded, stripped of
+    punctuation, and have their whitespace collapsed, so "Die Fabelhafte
+    Welt der Amélie!" and "die fabelhafte welt der amelie" normalize to the
+    same key. Leading articles are kept; see strip_articles.
+    """
+    normalized = (
+        titles.astype('string')
+        .str.normalize('NFKD')
+        .str.replace(COMBINING_MARKS_RE, '', regex=True)
+        .str.casefold()
+        .str.replace(r'[\W_]+', ' ', regex=True)
+        .str.strip()
+    )
+    return normalized.mask(normalized == '')
+
+
+def strip_articles(normalized, article_re=LEADING_ARTICLE_RE):
+    """Return normalized titles without a leading article, so "The Matrix" becomes "matrix".
+
+    The full article list mixes languages, so "Die Hard" becomes "hard" as
+    well. Titles stripped with it are therefore only used in keys that
+    include the year.
+    """
+    return normalized.str.replace(article_re, '', regex=True)
+
+
+def title_keys(titles):
+    """Return the plain lookup keys of titles: normalized, without an unambiguous leading article."""
+    return strip_articles(normalize_titles(titles), UNAMBIGUOUS_ARTICLE_RE)
+
+
+def article_keys(titles, years):
+    """Return the year-qualified keys of titles without any leading article, NA without a year."""
+    return ARTICLE_KEY_PREFIX + strip_articles(titles) + '|' + years
+
+
+def year_keys(years):
+    """Return the years as strings, with NA where the year is missing or not a number."""
+    return pd.to_numeric(years, errors='coerce').astype('Int64').astype('string')
+
+
+def imdb_row_keys(imdb_data, use_year=False):
+    """Return a DataFrame with the lookup keys of each IMDB row, one column per key.
+
+    With use_year, the title|year keys come first, followed by the plain
+    titles that match Werstreamt.es entries without a year, and the
+    article-stripped keys that match a title with or without its article.
+    """
+    titles = [title_keys(imdb_data['Original Title']), title_keys(imdb_data['Title'])]
+    if use_year:
+        if 'Year' in imdb_data.columns:
+            years = year_keys(imdb_data['Year'])
+        else:
+            years = pd.Series(pd.NA, index=imdb_data.index, dtype='string')
+        normalized = [normalize_titles(imdb_data['Original Title']), normalize_titles(imdb_data['Title'])]
+        titles = ([title + '|' + years for title in titles] + titles
+                  + [article_keys(title, years) for title in normalized])
+    return pd.concat(titles, axis=1, keys=range(len(titles)))
+
+
+class TitleIndex:
+    """Set of normalized Werstreamt.es titles, built once per Werstreamt.es load.
+
+    OriginalTitle and Title share a single hash index. With use_year, titles
+    are keyed by title and year so remakes don't match each other; entries
+    without a year still match on the title alone. Unambiguous leading
+    articles like "the" are always ignored, so "The Matrix" matches
+    "Matrix". With use_year, titles with a year are also keyed without any
+    leading article, so "La Haine" matches "Haine" of the same year, but
+    "Die Hard" (1988) never matches "Hard" (2012).
+    """
+
+    def __init__(self, werstreamtes_data, use_year=False):
+        self.use_year = use_year and 'Year' in werstreamtes_data.columns
+        self._index = pd.Index(self._werstreamtes_keys(werstreamtes_data).unique())
+
+    @classmethod
+    def from_chunks(cls, chunks, use_year=False):
+        """Build the index from an iterable of Werstreamt.es DataFrame chunks.
+
+        Only one chunk and the distinct keys seen so far are held in memory,
+        so the export itself never has to be loaded in full.
+        """
+        chunks = iter(chunks)
+        index = cls(next(chunks), use_year)
+        keys = set(index._index)
+        for chunk in chunks:
+            keys.update(index._werstreamtes_keys(chunk).unique())
+        index._index = pd.Index(list(keys), dtype=object)
+        return index
+
+    def _werstreamtes_keys(self, werstreamtes_data):
+        titles = [title_keys(werstreamtes_data['OriginalTitle']), title_keys(werstreamtes_data['Title'])]
+        if self.use_year:
+            years = year_keys(werstreamtes_data['Year'])
+            normalized = [normalize_titles(werstreamtes_data['OriginalTitle']),
+                          normalize_titles(werstreamtes_data['Title'])]
+            # Titles with a known year are only reachable through the title|year key
+            titles = ([(title + '|' + years).fillna(title.mask(years.notna())) for title in titles]
+                      + [article_keys(title, years) for title in normalized])
+        return pd.concat(titles, ignore_index=True).dropna()
+
+    def __len__(self):
+        return len(self._index)
+
+    @property
+    def keys(self):
+        """The normalized keys in the index, as a pandas Index."""
+        return self._index
+
+    def contains(self, keys):
+        """Return a boolean array telling which keys are in the index."""
+        return self._index.get_indexer(keys) != -1
+
+    def row_keys(self, imdb_data):
+        """Return a DataFrame with the lookup keys of each IMDB row, one column per key."""
+        return imdb_row_keys(imdb_data, self.use_year)
+
+    def match(self, imdb_data, row_keys=None):
+        """Return a boolean array marking the IMDB rows found on Werstreamt.es.
+
+        All lookup keys of all rows are looked up against the index in one pass.
+        """
+        if row_keys is None:
+            row_keys = self.row_keys(imdb_data)
+        keys = row_keys.to_numpy(dtype=object).ravel(order='F')
+        found = self.contains(keys).reshape(row_keys.shape[1], len(row_keys))
+        return np.logical_or.reduce(found, axis=0)
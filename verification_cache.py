@@ -0,0 +1,99 @@
+"""Persistent SQLite cache of Werstreamt.es verification verdicts."""
+import sqlite3
+import threading
+import time
+
+from verifier import FOUND, MISSING, VerificationResult
+
+CACHE_FILENAME = "werstreamtes_cache.sqlite"
+
+# Titles that are missing today may show up on a streaming service tomorrow,
+# so "missing" verdicts expire much sooner than "found" ones.
+DEFAULT_FOUND_TTL = 30 * 24 * 3600
+DEFAULT_MISSING_TTL = 24 * 3600
+DEFAULT_MAX_ENTRIES = 200000
+
+# Stay well below SQLite's limit on bound parameters per statement
+_QUERY_BATCH = 500
+
+
+class VerificationCache:
+    """Store each IMDB ID's verdict, and what it matched, with the time it was fetched.
+
+    found_ttl applies to IDs that were found on Werstreamt.es, missing_ttl to
+    IDs the search reported no results for. Once the cache holds more than
+    max_entries rows the oldest ones are evicted.
+    """
+
+    def __init__(self, path, found_ttl=DEFAULT_FOUND_TTL, missing_ttl=DEFAULT_MISSING_TTL,
+                 max_entries=DEFAULT_MAX_ENTRIES):
+        self.path = path
+        self.found_ttl = found_ttl
+        self.missing_ttl = missing_ttl
+        self.max_entries = max_entries
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS verdicts ("
+            "imdb_id TEXT PRIMARY KEY, is_missing INTEGER NOT NULL, fetched_at REAL NOT NULL, "
+            "matched_title TEXT, matched_url TEXT)"
+        )
+        # Caches written before matches were recorded lack the match columns
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(verdicts)")}
+        for column in ("matched_title", "matched_url"):
+            if column not in columns:
+                self._conn.execute(f"ALTER TABLE verdicts ADD COLUMN {column} TEXT")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS verdicts_fetched_at ON verdicts (fetched_at)")
+        self._conn.commit()
+
+    def get_many(self, imdb_ids):
+        """Return a dict mapping each ID with a fresh cached verdict to its VerificationResult."""
+        now = time.time()
+        imdb_ids = list(dict.fromkeys(imdb_ids))
+        verdicts = {}
+        with self._lock:
+            for start in range(0, len(imdb_ids), _QUERY_BATCH):
+                batch = imdb_ids[start:start + _QUERY_BATCH]
+                placeholders = ",".join("?" * len(batch))
+                rows = self._conn.execute(
+                    "SELECT imdb_id, is_missing, fetched_at, matched_title, matched_url "
+                    f"FROM verdicts WHERE imdb_id IN ({placeholders})",
+                    batch,
+                )
+                for imdb_id, is_missing, fetched_at, matched_title, matched_url in rows:
+                    ttl = self.missing_ttl if is_missing else self.found_ttl
+                    if now - fetched_at < ttl:
+                        verdict = MISSING if is_missing else FOUND
+                        verdicts[imdb_id] = VerificationResult(verdict, matched_title, matched_url)
+        return verdicts
+
+    def found_entries(self):
+        """Return (imdb_id, matched_title, matched_url) of every ID that was found, whatever its age."""
+        with self._lock:
+            return self._conn.execute(
+                "SELECT imdb_id, matched_title, matched_url FROM verdicts WHERE is_missing = 0"
+            ).fetchall()
+
+    def put(self, imdb_id, result):
+        """Record a freshly fetched MISSING or FOUND result. Call commit() to persist it."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO verdicts (imdb_id, is_missing, fetched_at, matched_title, matched_url) "
+                "VALUES (?, ?, ?, ?, ?)",
+                (imdb_id, int(result.verdict == MISSING), time.time(), result.title, result.url),
+            )
+
+    def commit(self):
+        """Evict the oldest entries beyond max_entries and flush to disk."""
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM verdicts WHERE imdb_id IN ("
+                "SELECT imdb_id FROM verdicts ORDER BY fetched_at DESC LIMIT -1 OFFSET ?)",
+                (self.max_entries,),
+            )
+            self._conn.commit()
+
+    def close(self):
+        self.commit()
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,277 @@
+"""Concurrent verification of IMDB IDs against the Werstreamt.es search page."""
+import html
+import re
+import sys
+import threading
+import time
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+from urllib.parse import urljoin, urlsplit
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from metrics import NULL_METRICS
+
+SEARCH_URL = "https://www.werstreamt.es/filme-serien/?q={imdb_id}"
+NO_RESULTS_TEXT = "Deine Suche lieferte leider keine Ergebnisse"
+
+# Verdicts for a single IMDB ID
+MISSING = "missing"
+FOUND = "found"
+UNKNOWN = "unknown"  # The lookup failed or was inconclusive; retry it on a later run
+
+# Outcome of one lookup; title and url describe the matched entry for FOUND verdicts
+VerificationResult = namedtuple("VerificationResult", ["verdict", "title", "url"], defaults=[None, None])
+
+# Search pages are read in chunks of this many bytes until the outcome is known
+CHUNK_SIZE = 8192
+
+# Once the outcome is known, up to this many more bytes are read so the connection can be reused
+DRAIN_LIMIT = 128 * 1024
+
+# Link to a film or series detail page in the search results
+RESULT_LINK_RE = re.compile(
+    rb'<a\s[^>]*?href="(?P<url>[^"]*/(?:film|serie)/details/[^"]+)"[^>]*>(?P<title>.*?)</a>',
+    re.DOTALL | re.IGNORECASE,
+)
+
+# (connect, read) timeouts in seconds, so a hung connection can't stall a run
+TIMEOUT = (5, 20)
+
+try:
+    import brotli  # noqa: F401  # urllib3 only decodes br responses if brotli is installed
+    ACCEPT_ENCODING = "gzip, deflate, br"
+except ImportError:
+    ACCEPT_ENCODING = "gzip, deflate"
+
+
+def create_session(pool_size=8, retries=3, backoff_factor=0.5):
+    """Return a keep-alive session with a connection pool sized for pool_size threads.
+
+    429 and 5xx responses are retried with exponential backoff, honouring
+    Retry-After when the server sends one.
+    """
+    retry = Retry(
+        total=retries,
+        backoff_factor=backoff_factor,
+        status_forcelist=(429, 500, 502, 503, 504),
+        respect_retry_after_header=True,
+        raise_on_status=False,
+    )
+    adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=retry)
+    session = requests.Session()
+    session.mount("https://", adapter)
+    session.mount("http://", adapter)
+    session.headers["Accept-Encoding"] = ACCEPT_ENCODING
+    return session
+
+
+class TokenBucket:
+    """Thread-safe token bucket that limits how often requests may be started."""
+
+    def __init__(self, rate, capacity=None):
+        self.rate = float(rate)
+        self.capacity = float(capacity) if capacity is not None else max(1.0, self.rate)
+        self._tokens = self.capacity
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def acquire(self):
+        """Block until a token is available and consume it."""
+        while True:
+            with self._lock:
+                now = time.monotonic()
+                self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+                self._updated = now
+                if self._tokens >= 1:
+                    self._tokens -= 1
+                    return
+                delay = (1 - self._tokens) / self.rate
+            time.sleep(delay)
+
+
+def parse_search_page(chunks, imdb_id, base_url=SEARCH_URL):
+    """Scan a search page chunk by chunk and stop as soon as the outcome is known.
+
+    The page is MISSING once the "no results" text shows up, and FOUND with
+    the matched title and URL once a result link follows the echoed search
+    term in the page body. Links before that belong to the page navigation.
+    A page with neither, e.g. an error or changed layout, is UNKNOWN.
+    """
+    no_results = NO_RESULTS_TEXT.encode("utf-8")
+    query = imdb_id.encode("utf-8")
+    data = b""
+    results_start = -1
+    for chunk in chunks:
+        scan_from = max(0, len(data) - len(no_results))
+        data += chunk
+        if data.find(no_results, scan_from) != -1:
+            return VerificationResult(MISSING)
+
+        if results_start == -1:
+            body_start = data.find(b"<body")
+            if body_start != -1:
+                results_start = data.find(query, body_start)
+        if results_start != -1:
+            match = RESULT_LINK_RE.search(data, results_start)
+            if match:
+                title = re.sub(r"<[^>]+>", "", match.group("title").decode("utf-8", "replace"))
+                url = html.unescape(match.group("url").decode("utf-8", "replace"))
+                return VerificationResult(FOUND, html.unescape(title).strip(), urljoin(base_url, url))
+
+    # Neither a "no results" text nor a result, so the page tells us nothing
+    return VerificationResult(UNKNOWN)
+
+
+def drain(response, chunks, limit=DRAIN_LIMIT):
+    """Read the rest of a response body so its keep-alive connection goes back to the pool.
+
+    A connection is only reusable once its body has been read to the end,
+    and reading the rest of a search page costs far less than a new TCP and
+    TLS handshake. Bodies with more than limit bytes left on the wire are
+    abandoned instead, and their connection is closed.
+    """
+    length = response.headers.get("Content-Length", "")
+    if length.isdigit() and int(length) - response.raw.tell() > limit:
+        return
+    start = response.raw.tell()
+    for _ in chunks:
+        if response.raw.tell() - start > limit:
+            return
+
+
+def verify_entry(imdb_id, search_url=SEARCH_URL, session=None, timeout=TIMEOUT, metrics=NULL_METRICS):
+    """Verify if an entry is missing from Werstreamt.es.
+
+    Returns a VerificationResult whose verdict is MISSING, FOUND, or UNKNOWN
+    if the lookup failed. The response body is streamed and parsed only
+    until the verdict is known; the rest is drained, up to DRAIN_LIMIT, so
+    the connection can be reused.
+    """
+    start = time.perf_counter()
+    try:
+        url = search_url.format(imdb_id=imdb_id)
+        with (session or requests).get(url, timeout=timeout, stream=True) as response:
+            try:
+                response.raise_for_status()
+                chunks = response.iter_content(CHUNK_SIZE)
+                result = parse_search_page(chunks, imdb_id, url)
+                drain(response, chunks)
+            finally:
+                # Bytes read off the wire, before decompression
+                metrics.increment('bytes_transferred', response.raw.tell())
+        metrics.increment(f'verdicts_{result.verdict}')
+        return result
+
+    except Exception as e:
+        print(f"Error verifying entry {imdb_id}: {str(e)}", file=sys.stderr)
+        metrics.increment('lookup_errors')
+        return VerificationResult(UNKNOWN)
+    finally:
+        metrics.observe_latency(time.perf_counter() - start)
+
+
+class VerificationEngine:
+    """Verify many IMDB IDs with bounded concurrency and a per-host rate limit."""
+
+    def __init__(self, max_workers=8, requests_per_second=10.0, burst=None, search_url=SEARCH_URL,
+                 cache=None, commit_every=50, session=None, timeout=TIMEOUT, metrics=NULL_METRICS, mirror=None):
+        self.max_workers = max_workers
+        self.requests_per_second = requests_per_second
+        self.burst = burst
+        self.search_url = search_url
+        self.cache = cache
+        self.mirror = mirror
+        self.commit_every = commit_every
+        self.session = session if session is not None else create_session(max_workers)
+        self.timeout = timeout
+        self.metrics = metrics
+        self._buckets = {}
+        self._buckets_lock = threading.Lock()
+
+    def _bucket_for(self, host):
+        """Return the token bucket shared by all requests to the given host."""
+        with self._buckets_lock:
+            bucket = self._buckets.get(host)
+            if bucket is None:
+                bucket = TokenBucket(self.requests_per_second, self.burst)
+                self._buckets[host] = bucket
+            return bucket
+
+    def _verify(self, imdb_id):
+        self._bucket_for(urlsplit(self.search_url).netloc).acquire()
+        return verify_entry(imdb_id, self.search_url, self.session, self.timeout, self.metrics)
+
+    def verify_all(self, imdb_ids):
+        """Yield (imdb_id, VerificationResult) pairs in completion order.
+
+        IDs listed in the catalog mirror, then IDs with a fresh verdict in
+        the cache are yielded first without any network call. For the rest,
+        at most max_workers requests are in flight at any time, so results
+        stream back as soon as each lookup finishes. Found results are added
+        to the mirror.
+        """
+        imdb_ids = list(imdb_ids)
+        if self.mirror is not None:
+            mirrored = self.mirror.lookup(imdb_ids)
+            self.metrics.increment('mirror_hits', len(mirrored))
+            for imdb_id in imdb_ids:
+                if imdb_id in mirrored:
+                    yield imdb_id, mirrored[imdb_id]
+            imdb_ids = [imdb_id for imdb_id in imdb_ids if imdb_id not in mirrored]
+
+        if self.cache is not None:
+            cached = self.cache.get_many(imdb_ids)
+            self.metrics.increment('cache_hits', len(cached))
+            self.metrics.increment('cache_misses', len(imdb_ids) - len(cached))
+            for imdb_id in imdb_ids:
+                if imdb_id in cached:
+                    yield imdb_id, cached[imdb_id]
+            imdb_ids = [imdb_id for imdb_id in imdb_ids if imdb_id not in cached]
+
+        try:
+            for count, (imdb_id, result) in enumerate(self._verify_remote(imdb_ids), start=1):
+                # Failed lookups are not cached so the next run retries them
+                if self.cache is not None and result.verdict != UNKNOWN:
+                    self.cache.put(imdb_id, result)
+                    if count % self.commit_every == 0:
+                        self.cache.commit()
+                if self.mirror is not None:
+                    self.mirror.add(imdb_id, result)
+                yield imdb_id, result
+        finally:
+            if self.cache is not None:
+                self.cache.commit()
+            if self.mirror is not None:
+                self.mirror.commit()
+
+    def _verify_remote(self, imdb_ids):
+        pending_ids = iter(imdb_ids)
+        executor = ThreadPoolExecutor(max_workers=self.max_workers)
+        in_flight = {}
+
+        def submit_next():
+            for imdb_id in pending_ids:
+                in_flight[executor.submit(self._verify, imdb_id)] = imdb_id
+                return True
+            return False
+
+        try:
+            for _ in range(self.max_workers):
+                if not submit_next():
+                    break
+
+            while in_flight:
+                done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+                for future in done:
+                    imdb_id = in_flight.pop(future)
+                    submit_next()
+                    yield imdb_id, future.result()
+        finally:
+            # When the caller stops early, drop queued lookups and let the
+            # running ones finish in the background instead of blocking here
+            for future in in_flight:
+                future.cancel()
+            executor.shutdown(wait=False)